@@ -0,0 +1,197 @@
+# ====================
+# 베스트 플레이어 벤치마크
+# ====================
+
+# 패키지 임포트
+from game import State, random_action, alpha_beta_action, mcts_action
+from pv_mcts import pv_mcts_action
+from folded_network import load_inference_model
+from playout import monte_carlo_action
+from contextlib import redirect_stdout
+from multiprocessing import get_context
+from datetime import datetime
+from math import log10, sqrt
+import tensorflow as tf
+import time
+import os
+
+# 파라미터 준비
+BM_GAME_COUNT = 200  # 대전 상대별 게임 수
+BM_PROCESS_COUNT = 4  # 대전 워커 프로세스 수(1: 메인 프로세스에서 실행)
+BM_OPENING_MOVES = 1  # 게임 시작 시 무작위로 두는 수(결정적인 플레이어끼리도 다른 게임이 되도록)
+BM_Z = 1.96  # 신뢰 구간의 z값(95%)
+BM_LOG_PATH = './benchmark.log'  # 백그라운드 실행 시 결과를 추가하는 파일
+
+# 대전 상대(이름 → 행동 선택 함수)
+OPPONENTS = {
+    'Random': random_action,
+    'AlphaBeta': alpha_beta_action,
+    'MCTS': mcts_action,
+    'MonteCarlo': monte_carlo_action,
+}
+
+# 워커 프로세스별 상태
+worker_player = None  # 베스트 플레이어의 행동 선택 함수
+worker_error = None  # 초기화 중 발생한 예외(첫 대전에서 다시 발생시킴)
+
+
+# 행동 선택 시간을 기록하는 행동 선택 함수 생성
+def timed_action(next_action, times):
+    def timed_action(state):
+        start = time.perf_counter()
+        action = next_action(state)
+        times.append(time.perf_counter() - start)
+        return action
+
+    return timed_action
+
+
+# 1 게임 실행(선 수 플레이어의 포인트 반환)
+def play(next_actions):
+    # 상태 생성
+    state = State()
+
+    # 무작위로 둔 국면에서 시작
+    for _ in range(BM_OPENING_MOVES):
+        state = state.next(random_action(state))
+
+    # 게임 종료 시까지 반복
+    while not state.is_done():
+        next_action = next_actions[0] if state.is_first_player() else next_actions[1]
+        state = state.next(next_action(state))
+
+    # 1: 선 수 플레이어 승리, 0: 선 수 플레이어 패배, 0.5: 무승부
+    if state.is_lose():
+        return 0 if state.is_first_player() else 1
+    return 0.5
+
+
+# 베스트 플레이어의 행동 선택 함수 생성
+def load_player(model_path):
+    global worker_player
+    worker_player = pv_mcts_action(load_inference_model(model_path), 0.0)
+
+
+# 워커 프로세스 초기화
+def init_worker(model_path):
+    global worker_error
+
+    # 코어를 프로세스끼리 나눠 쓰도록 프로세스당 스레드 1개로 제한
+    tf.config.threading.set_intra_op_parallelism_threads(1)
+    tf.config.threading.set_inter_op_parallelism_threads(1)
+
+    # 모델은 워커당 1회만 로드
+    # (초기화 중 워커가 종료되면 Pool이 워커를 계속 다시 생성해 멈추므로 예외는 보관해 두고 대전에서 발생시킴)
+    try:
+        load_player(model_path)
+    except Exception as e:
+        worker_error = e
+
+
+# 1 게임 대전(짝수 번째 게임은 베스트 플레이어가 선 수)
+def play_worker(task):
+    if worker_error is not None:
+        raise worker_error
+    name, i = task
+    times = ([], [])  # (베스트 플레이어, 대전 상대)의 행동 선택 시간
+    next_actions = [timed_action(worker_player, times[0]), timed_action(OPPONENTS[name], times[1])]
+    if i % 2 == 0:
+        point = play(next_actions)
+    else:
+        point = 1 - play(list(reversed(next_actions)))
+    return name, point, sum(times[0]), len(times[0]), sum(times[1]), len(times[1])
+
+
+# 포인트를 Elo 레이팅 차로 변환
+def elo(score):
+    score = min(max(score, 0.001), 0.999)
+    return -400 * log10(1 / score - 1)
+
+
+# 대전 상대별 결과 출력
+def report(results):
+    summary = {}
+    print('{:<11}{:>5}{:>5}{:>5}{:>7}{:>17}{:>17}{:>10}{:>10}'.format(
+        'VS', 'W', 'D', 'L', 'Score', 'CI', 'Elo CI', 'ms/move', 'opp ms'))
+    for name in OPPONENTS:
+        rows = [r for r in results if r[0] == name]
+        if not rows:
+            continue
+        points = [r[1] for r in rows]
+        n = len(points)
+        win, draw = points.count(1), points.count(0.5)
+        lose = n - win - draw
+
+        # 평균 포인트와 정규 근사 신뢰 구간
+        score = sum(points) / n
+        sd = sqrt(sum((x - score) ** 2 for x in points) / max(n - 1, 1))
+        low, high = max(score - BM_Z * sd / sqrt(n), 0), min(score + BM_Z * sd / sqrt(n), 1)
+
+        # 1수당 평균 시간(밀리초)
+        player_ms = sum(r[2] for r in rows) / max(sum(r[3] for r in rows), 1) * 1000
+        opponent_ms = sum(r[4] for r in rows) / max(sum(r[5] for r in rows), 1) * 1000
+
+        print('{:<11}{:>5}{:>5}{:>5}{:>7.3f}{:>17}{:>17}{:>10.2f}{:>10.2f}'.format(
+            name, win, draw, lose, score, '[{:.3f}, {:.3f}]'.format(low, high),
+            '[{:+.0f}, {:+.0f}]'.format(elo(low), elo(high)), player_ms, opponent_ms))
+        summary[name] = dict(win=win, draw=draw, lose=lose, score=score, ci=(low, high),
+                             player_ms=player_ms, opponent_ms=opponent_ms)
+    return summary
+
+
+# 모든 대전 상대와 여러 프로세스로 대전
+def benchmark(model_path='./model/best.h5', game_count=BM_GAME_COUNT, process_count=BM_PROCESS_COUNT,
+              progress=True):
+    # 진행 상황이 대전 상대별로 고르게 나아가도록 게임을 번갈아 배치
+    tasks = [(name, i) for i in range(game_count) for name in OPPONENTS]
+    start = time.perf_counter()
+
+    # 여러 프로세스로 대전
+    results = []
+    if process_count > 1:
+        # TensorFlow를 로드한 프로세스는 fork할 수 없으므로 spawn으로 워커 생성
+        context = get_context('spawn')
+        with context.Pool(process_count, initializer=init_worker, initargs=(model_path,)) as pool:
+            for result in pool.imap_unordered(play_worker, tasks, chunksize=4):
+                results.append(result)
+                if progress:
+                    print('\rBenchmark {}/{}'.format(len(results), len(tasks)), end='')
+
+    # 메인 프로세스에서 1게임씩 대전
+    else:
+        load_player(model_path)
+        for task in tasks:
+            results.append(play_worker(task))
+            if progress:
+                print('\rBenchmark {}/{}'.format(len(results), len(tasks)), end='')
+    if progress:
+        print('')
+
+    print('Benchmark {} {:.1f}s'.format(model_path, time.perf_counter() - start))
+    return report(results)
+
+
+# 결과를 파일에 추가하는 벤치마크(진행 상황은 출력하지 않음)
+def benchmark_to_log(model_path):
+    with open(BM_LOG_PATH, mode='a') as f, redirect_stdout(f):
+        print('====================', datetime.now().strftime('%Y-%m-%d %H:%M:%S'))
+        benchmark(model_path, progress=False)
+
+
+# 학습 사이클을 멈추지 않도록 백그라운드 프로세스에서 벤치마크 시작(model: 상주시킨 모델)
+def start_benchmark(model=None):
+    # 상주 모델은 벤치마크 중 교체되지 않도록 별도 파일로 저장
+    model_path = './model/best.h5'
+    if model is not None:
+        model_path = './model/benchmark.h5'
+        model.save('./model/benchmark.tmp.h5')
+        os.replace('./model/benchmark.tmp.h5', model_path)
+
+    process = get_context('spawn').Process(target=benchmark_to_log, args=(model_path,))
+    process.start()
+    return process
+
+
+# 동작 확인
+if __name__ == '__main__':
+    benchmark()
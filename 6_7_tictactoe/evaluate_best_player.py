@@ -5,13 +5,16 @@
 # 패키지 임포트
 from game import State, random_action, alpha_beta_action, mcts_action
 from pv_mcts import pv_mcts_action
-from tensorflow.keras.models import load_model
+from folded_network import load_inference_model
+from playout import monte_carlo_action
+from benchmark import start_benchmark
 from tensorflow.keras import backend as K
 from pathlib import Path
 import numpy as np
 
 # 파라미터 준비
 EP_GAME_COUNT = 10  # 평가 1회당 게임 수
+EP_BACKGROUND = False  # benchmark.py로 백그라운드에서 평가(결과는 benchmark.log에 추가)
 
 
 # 선 수를 둔 플레이어의 포인트
@@ -64,10 +67,17 @@ def evaluate_algorithm_of(label, next_actions):
     print(label, average_point)
 
 
-# 베스트 플레이어 평가
-def evaluate_best_player():
-    # 베스트 플레이어 모델 로드
-    model = load_model('./model/best.h5')
+# 베스트 플레이어 평가(model: 상주시킨 베스트 플레이어 모델 또는 그 추론 함수, 백그라운드 평가는 모델만)
+def evaluate_best_player(model=None):
+    # 학습 사이클을 멈추지 않고 여러 프로세스로 평가
+    if EP_BACKGROUND:
+        start_benchmark(model)
+        return
+
+    # 베스트 플레이어 모델 로드(상주 모델이 주어진 경우 그대로 사용)
+    resident = model is not None
+    if not resident:
+        model = load_inference_model('./model/best.h5')
 
     # PV MCTS로 행동 선택을 수행하는 함수 생성
     next_pv_mcts_action = pv_mcts_action(model, 0.0)
@@ -84,9 +94,14 @@ def evaluate_best_player():
     next_actions = (next_pv_mcts_action, mcts_action)
     evaluate_algorithm_of('VS_MCTS', next_actions)
 
-    # 모델 파기
-    K.clear_session()
-    del model
+    # VS 원시 몬테카를로법(넘파이로 일괄 실행한 플레이아웃)
+    next_actions = (next_pv_mcts_action, monte_carlo_action)
+    evaluate_algorithm_of('VS_MonteCarlo', next_actions)
+
+    # 모델 파기(상주 모델은 유지)
+    if not resident:
+        K.clear_session()
+        del model
 
 
 # 동작 확인
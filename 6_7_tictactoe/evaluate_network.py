@@ -4,16 +4,30 @@
 
 # 패키지 임포트
 from game import State
-from pv_mcts import pv_mcts_action
-from tensorflow.keras.models import load_model
+from pv_mcts import pv_mcts_action, PV_BATCH_SIZE
+from folded_network import load_inference_model
 from tensorflow.keras import backend as K
 from pathlib import Path
 from shutil import copy
+from multiprocessing import get_context
+from math import log
+import tensorflow as tf
 import numpy as np
+import os
 
 # 파라미터 준비
 EN_GAME_COUNT = 10  # 평가 1회 당 게임 수(오리지널: 400)
 EN_TEMPERATURE = 1.0  # 볼츠만 분포 온도
+EN_PROCESS_COUNT = 1  # 대전 워커 프로세스 수(1: 메인 프로세스에서 실행)
+EN_SPRT = False  # 순차 확률비 검정(SPRT)으로 판정이 나면 대전 조기 종료
+EN_SPRT_ELO0 = 0  # 귀무가설(승격하지 않음)의 Elo 레이팅 차
+EN_SPRT_ELO1 = 35  # 대립가설(승격)의 Elo 레이팅 차
+EN_SPRT_ALPHA = 0.05  # 강하지 않은(Elo 차 EN_SPRT_ELO0) 모델을 승격시킬 확률의 상한
+EN_SPRT_BETA = 0.05  # 강한(Elo 차 EN_SPRT_ELO1) 모델을 기각할 확률의 상한
+
+# 워커 프로세스별 상태
+worker_actions = None  # (최신 플레이어, 베스트 플레이어)의 행동 선택 함수
+worker_error = None  # 초기화 중 발생한 예외(첫 대전에서 다시 발생시킴)
 
 
 # 선 수를 둔 플레이어의 포인트
@@ -46,50 +60,137 @@ def play(next_actions):
     return first_player_point(state)
 
 
-# 베스트 플레이어 교대
-def update_best_player():
-    copy('./model/latest.h5', './model/best.h5')
-    print('Change BestPlayer')
+# 최신 플레이어의 포인트(짝수 번째 게임은 최신 플레이어가 선 수)
+def play_game(next_actions, i):
+    if i % 2 == 0:
+        return play(next_actions)
+    return 1 - play(list(reversed(next_actions)))
 
 
-# 네트워크 평가
-def evaluate_network():
+# 최신 플레이어와 베스트 플레이어의 행동 선택 함수 생성
+def load_actions(model0=None, model1=None):
     # 최신 플레이어 모델 로드
-    model0 = load_model('./model/latest.h5')
+    if model0 is None:
+        model0 = load_inference_model('./model/latest.h5')
 
     # 베스트 플레이어 모델 로드
-    model1 = load_model('./model/best.h5')
+    if model1 is None:
+        model1 = load_inference_model('./model/best.h5')
 
     # PV MCTS를 활용해 행동 선택을 수행하는 함수 생성
-    next_action0 = pv_mcts_action(model0, EN_TEMPERATURE)
-    next_action1 = pv_mcts_action(model1, EN_TEMPERATURE)
-    next_actions = (next_action0, next_action1)
-
-    # 여러 차례 대전을 반복
-    total_point = 0
-    for i in range(EN_GAME_COUNT):
-        # 1 게임 실행
-        if i % 2 == 0:
-            total_point += play(next_actions)
-        else:
-            total_point += 1 - play(list(reversed(next_actions)))
+    next_action0 = pv_mcts_action(model0, EN_TEMPERATURE, PV_BATCH_SIZE)
+    next_action1 = pv_mcts_action(model1, EN_TEMPERATURE, PV_BATCH_SIZE)
+    return next_action0, next_action1
+
+
+# 워커 프로세스 초기화
+def init_worker():
+    global worker_actions, worker_error
+
+    # 코어를 프로세스끼리 나눠 쓰도록 프로세스당 스레드 1개로 제한
+    tf.config.threading.set_intra_op_parallelism_threads(1)
+    tf.config.threading.set_inter_op_parallelism_threads(1)
+
+    # 두 모델은 워커당 1회만 로드
+    # (초기화 중 워커가 종료되면 Pool이 워커를 계속 다시 생성해 멈추므로 예외는 보관해 두고 대전에서 발생시킴)
+    try:
+        worker_actions = load_actions()
+    except Exception as e:
+        worker_error = e
+
+
+# 워커 프로세스의 대전
+def play_worker(i):
+    if worker_error is not None:
+        raise worker_error
+    return play_game(worker_actions, i)
+
+
+# 최신 플레이어 포인트의 로그 우도비(정규 근사)
+def sprt_llr(points):
+    # 결과가 한쪽으로 치우친 초반에 분산이 0이 되지 않도록 1승 1패를 더해 계산
+    points = list(points) + [1, 0]
+    n = len(points)
+    mean = sum(points) / n
+    variance = sum((x - mean) ** 2 for x in points) / n
+
+    # Elo 레이팅 차를 기대 포인트로 변환
+    s0 = 1 / (1 + 10 ** (-EN_SPRT_ELO0 / 400))
+    s1 = 1 / (1 + 10 ** (-EN_SPRT_ELO1 / 400))
+    return (s1 - s0) * (sum(points) - n * (s0 + s1) / 2) / variance
+
+
+# 순차 확률비 검정(1: 승격, -1: 기각, 0: 대전 계속)
+def sprt(points):
+    llr = sprt_llr(points)
+    if llr >= log((1 - EN_SPRT_BETA) / EN_SPRT_ALPHA):
+        return 1
+    if llr <= log(EN_SPRT_BETA / (1 - EN_SPRT_ALPHA)):
+        return -1
+    return 0
+
+
+# 대전 결과 모으기
+def collect_points(results):
+    points = []
+    for point in results:
+        points.append(point)
 
         # 출력
-        print('\rEvaluate {}/{}'.format(i + 1, EN_GAME_COUNT), end='')
+        print('\rEvaluate {}/{}'.format(len(points), EN_GAME_COUNT), end='')
+
+        # 순차 확률비 검정으로 판정이 나면 중단
+        if EN_SPRT:
+            decision = sprt(points)
+            if decision != 0:
+                print('')
+                print('SPRT', 'accept' if decision == 1 else 'reject', 'after', len(points), 'games')
+                return points, decision
     print('')
+    return points, 0
+
+
+# 베스트 플레이어 교대
+def update_best_player():
+    # 셀프 플레이 워커가 복사 중인 파일을 읽지 않도록 임시 파일을 거쳐 교체
+    copy('./model/latest.h5', './model/best.tmp.h5')
+    os.replace('./model/best.tmp.h5', './model/best.h5')
+    print('Change BestPlayer')
+
+
+# 네트워크 평가(model0, model1: 상주시킨 최신 플레이어와 베스트 플레이어 모델 또는 그 추론 함수)
+def evaluate_network(model0=None, model1=None):
+    # 상주 모델이 주어진 경우 로드와 파기를 생략
+    resident = model0 is not None
+
+    # 여러 프로세스로 대전(SPRT로 판정이 나면 남은 게임은 중단)
+    if EN_PROCESS_COUNT > 1:
+        # TensorFlow를 로드한 프로세스는 fork할 수 없으므로 spawn으로 워커 생성
+        context = get_context('spawn')
+        with context.Pool(EN_PROCESS_COUNT, initializer=init_worker) as pool:
+            # SPRT는 게임 순서대로 결과를 모음(끝난 순서로 모으면 빨리 끝나는 게임의 결과에 치우침)
+            imap = pool.imap if EN_SPRT else pool.imap_unordered
+            points, decision = collect_points(imap(play_worker, range(EN_GAME_COUNT)))
+
+    # 메인 프로세스에서 1게임씩 대전
+    else:
+        next_actions = load_actions(model0, model1)
+        points, decision = collect_points(play_game(next_actions, i) for i in range(EN_GAME_COUNT))
+
+        # 모델 파기(상주 모델은 유지)
+        del next_actions
+        if not resident:
+            K.clear_session()
 
     # 평균 포인트 계산
-    average_point = total_point / EN_GAME_COUNT
+    average_point = sum(points) / len(points)
     print('AveragePoint', average_point)
 
-    # 모델 파기
-    K.clear_session()
-    del model0
-    del model1
-
-    # 베스트 플레이어 교대
-    if average_point > 0.5:
-        update_best_player()
+    # 베스트 플레이어 교대(SPRT로 판정이 나지 않은 경우 평균 포인트로 판정)
+    if decision == 1 or (decision == 0 and average_point > 0.5):
+        # 상주 모델의 가중치 교체는 호출한 쪽에서 수행
+        if not resident:
+            update_best_player()
         return True
     else:
         return False
@@ -0,0 +1,124 @@
+# ====================
+# 추론 전용 듀얼 네트워크 생성
+# ====================
+
+# 패키지 임포트
+from dual_network import DN_INPUT_SHAPE
+from numpy_network import fold_weights
+from tensorflow.keras.layers import Activation, Add, Conv2D, Dense, GlobalAveragePooling2D, Input
+from tensorflow.keras.models import Model, load_model
+import os
+
+# 파라미터 준비
+FN_QUANTIZED = False  # MCTS 플레이어가 int8 양자화 모델(quantized_network.py)로 추론
+
+
+# 배치 정규화를 합친 컨볼루션 레이어 생성(정규화 항 없음)
+def folded_conv(weights, i):
+    w = weights['conv{}_w'.format(i)]
+    layer = Conv2D(w.shape[3], 3, padding='same', use_bias=True)
+    return layer, [w, weights['conv{}_b'.format(i)]]
+
+
+# 배치 정규화를 컨볼루션에 합친 추론 전용 모델 생성
+def folded_network(model):
+    weights = fold_weights(model)
+    conv_count = sum(1 for k in weights if k.startswith('conv') and k.endswith('_w'))
+    layers = []  # (레이어, 설정할 가중치)
+
+    # 입력 레이어
+    input = Input(shape=DN_INPUT_SHAPE)
+
+    # 컨볼루션 레이어
+    layer = folded_conv(weights, 0)
+    layers.append(layer)
+    x = Activation('relu')(layer[0](input))
+
+    # 레지듀얼 블록
+    for i in range(1, conv_count, 2):
+        sc = x
+        layer = folded_conv(weights, i)
+        layers.append(layer)
+        x = Activation('relu')(layer[0](x))
+        layer = folded_conv(weights, i + 1)
+        layers.append(layer)
+        x = Add()([layer[0](x), sc])
+        x = Activation('relu')(x)
+
+    # 풀링 레이어
+    x = GlobalAveragePooling2D()(x)
+
+    # policy 출력
+    layer = Dense(weights['policy_w'].shape[1], activation='softmax', name='pi')
+    layers.append((layer, [weights['policy_w'], weights['policy_b']]))
+    p = layer(x)
+
+    # value 출력
+    layer = Dense(1)
+    layers.append((layer, [weights['value_w'], weights['value_b']]))
+    v = Activation('tanh', name='v')(layer(x))
+
+    # 모델 생성 후 가중치 설정
+    folded = Model(inputs=input, outputs=[p, v])
+    for layer, w in layers:
+        layer.set_weights(w)
+    return folded
+
+
+# 추론 전용 모델 파일 경로(best.h5 → best_folded.h5)
+def folded_path(model_path):
+    return model_path.replace('.h5', '_folded.h5')
+
+
+# 모델 파일을 추론 전용 모델 파일로 변환
+def export_folded(model_path='./model/best.h5'):
+    # 모델 로드
+    model = load_model(model_path)
+
+    # 임시 파일에 저장한 후 교체(여러 프로세스가 동시에 변환해도 완성된 파일만 보이도록)
+    path = folded_path(model_path)
+    temp_path = path.replace('.h5', '.{}.tmp.h5'.format(os.getpid()))
+    folded_network(model).save(temp_path)
+    os.replace(temp_path, path)
+
+
+# MCTS 플레이어용 모델 로드(추론 전용 모델이 모델 파일보다 오래된 경우 다시 변환)
+def load_inference_model(model_path='./model/best.h5'):
+    # int8 양자화 모델 사용 시
+    if FN_QUANTIZED:
+        from quantized_network import load_quantized_network
+        return load_quantized_network(model_path)
+
+    path = folded_path(model_path)
+    if not os.path.exists(path) or os.path.getmtime(path) < os.path.getmtime(model_path):
+        export_folded(model_path)
+    return load_model(path, compile=False)
+
+
+# 상주 모델의 추론 함수 생성(load_inference_model()과 같이 배치 정규화를 합친 모델 또는 int8 양자화 모델로 추론)
+# 가중치를 교체한 경우에만 다시 생성해 재사용
+def resident_inference(model):
+    from pv_mcts import inference_function
+    if FN_QUANTIZED:
+        from quantized_network import quantized_network
+        return quantized_network(model)
+    return inference_function(folded_network(model))
+
+
+# 동작 확인
+if __name__ == '__main__':
+    import numpy as np
+
+    # 베스트 플레이어 모델을 변환하고 차이 확인
+    export_folded()
+    model = load_model('./model/best.h5')
+    folded = load_inference_model()
+    print('layers', len(model.layers), '->', len(folded.layers))
+
+    # 무작위 입력으로 출력 비교
+    a, b, c = DN_INPUT_SHAPE
+    x = np.random.randint(0, 2, (64, a, b, c)).astype(np.float32)
+    y0 = model(x, training=False)
+    y1 = folded(x, training=False)
+    print('policy max diff', np.abs(np.asarray(y0[0]) - np.asarray(y1[0])).max())
+    print('value max diff', np.abs(np.asarray(y0[1]) - np.asarray(y1[1])).max())
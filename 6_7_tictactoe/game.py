@@ -6,15 +6,53 @@
 import random
 import math
 
+# 조브리스트 해시용 난수(고정 시드)
+zobrist_random = random.Random(0)
+ZOBRIST_PIECES = [[zobrist_random.getrandbits(64) for _ in range(9)] for _ in range(2)]  # [선 수/후 수][매스]
+ZOBRIST_SIDE = zobrist_random.getrandbits(64)  # 후 수 차례
+
+
+# 정사각형 보드의 대칭 변환 8종(변환 후 매스 → 변환 전 매스의 인덱스 리스트)
+def square_symmetries(size):
+    symmetries = []
+    for k in range(8):
+        perm = []
+        for i in range(size * size):
+            y, x = divmod(i, size)
+            if k & 1: x = size - 1 - x  # 좌우 반전
+            if k & 2: y = size - 1 - y  # 상하 반전
+            if k & 4: x, y = y, x  # 대각선 반전
+            perm.append(x + y * size)
+        symmetries.append(perm)
+    return symmetries
+
+
+# 학습 데이터 증강용 대칭 변환(매스의 인덱스 리스트, 행동의 인덱스 리스트)
+SYMMETRIES = [(perm, perm) for perm in square_symmetries(3)]
+
 
 # 게임 상태
 class State:
     # 초기화
-    def __init__(self, pieces=None, enemy_pieces=None):
+    def __init__(self, pieces=None, enemy_pieces=None, zobrist=None):
         # 돌의 배치
         self.pieces = pieces if pieces != None else [0] * 9
         self.enemy_pieces = enemy_pieces if enemy_pieces != None else [0] * 9
 
+        # 조브리스트 해시(다음 상태는 차분으로 갱신)
+        self.zobrist = zobrist if zobrist != None else self.compute_zobrist()
+
+    # 조브리스트 해시 계산
+    def compute_zobrist(self):
+        own = 0 if self.is_first_player() else 1
+        zobrist = 0 if own == 0 else ZOBRIST_SIDE
+        for i in range(9):
+            if self.pieces[i] == 1:
+                zobrist ^= ZOBRIST_PIECES[own][i]
+            if self.enemy_pieces[i] == 1:
+                zobrist ^= ZOBRIST_PIECES[1 - own][i]
+        return zobrist
+
     # 돌의 수 얻기
     def piece_count(self, pieces):
         count = 0
@@ -54,7 +92,9 @@ class State:
     def next(self, action):
         pieces = self.pieces.copy()
         pieces[action] = 1
-        return State(self.enemy_pieces, pieces)
+        own = 0 if self.is_first_player() else 1
+        zobrist = self.zobrist ^ ZOBRIST_PIECES[own][action] ^ ZOBRIST_SIDE
+        return State(self.enemy_pieces, pieces, zobrist)
 
     # 합법적인 수의 리스트 얻기
     def legal_actions(self):
@@ -114,19 +154,11 @@ def alpha_beta(state, alpha, beta):
     return alpha
 
 
-# 알파베타법을 활용한 생동 선택
+# 알파베타법을 활용한 생동 선택(알파베타법으로 구한 완전 해석 테이블을 참조해 탐색 없이 같은 행동 선택)
 def alpha_beta_action(state):
-    # 합법적인 수의 상태 가치 계산
-    best_action = 0
-    alpha = -float('inf')
-    for action in state.legal_actions():
-        score = -alpha_beta(state.next(action), -float('inf'), -alpha)
-        if score > alpha:
-            best_action = action
-            alpha = score
-
-    # 합법적인 수의 상태 가치의 최대값을 갖는 행동 반환
-    return best_action
+    # tablebase.py가 이 모듈을 임포트하므로 여기서 임포트
+    from tablebase import tablebase_action
+    return tablebase_action(state)
 
 
 # 플레이아웃
@@ -148,8 +180,8 @@ def argmax(collection):
     return collection.index(max(collection))
 
 
-# 몬테카를로 트리 탐색을 활용한 행동 선택
-def mcts_action(state):
+# 몬테카를로 트리 탐색을 활용한 행동 선택(playout_function: 리프 노드의 가치를 얻는 플레이아웃)
+def mcts_action(state, playout_function=playout):
     # 몬테카를로 트리 탐색 노드
     class node:
         # 초기화
@@ -174,7 +206,7 @@ def mcts_action(state):
             # 자녀 노드가 존재하지 않는 경우
             if not self.child_nodes:
                 # 플레이아웃으로 가치 얻기
-                value = playout(self.state)
+                value = playout_function(self.state)
 
                 # 가치 누계와 시행 횟수 갱신
                 self.w += value
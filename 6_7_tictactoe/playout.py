@@ -0,0 +1,91 @@
+# ====================
+# 넘파이로 여러 게임을 동시에 진행하는 플레이아웃
+# ====================
+
+# 패키지 임포트
+import numpy as np
+
+# 파라미터 준비
+PO_PLAYOUT_COUNT = 64  # 평가 1회당 동시에 실행할 플레이아웃 수
+LINES = np.array([[0, 1, 2], [3, 4, 5], [6, 7, 8], [0, 3, 6], [1, 4, 7], [2, 5, 8], [0, 4, 8], [2, 4, 6]])  # 3개 연결 라인
+
+
+# 여러 보드의 랜덤 플레이아웃 결과(boards: 1이 둘 차례인 플레이어의 돌, -1이 상대의 돌, 0이 빈칸인 배열)
+def random_playouts(boards):
+    boards = boards.copy()
+    count = len(boards)
+    rows = np.arange(count)
+
+    # 결과(둘 차례인 플레이어 기준으로 1: 승리, 0: 무승부, -1: 패배), 이미 진 보드는 -1
+    values = np.where((boards[:, LINES].sum(axis=2) == -3).any(axis=1), -1, 0).astype(np.int8)
+    playing = values == 0  # 끝나지 않은 게임
+
+    # 양쪽 플레이어가 번갈아 두기
+    player = 1
+    while True:
+        # 빈칸이 없는 보드는 무승부
+        playing &= (boards == 0).any(axis=1)
+        if not playing.any():
+            break
+
+        # 빈칸 중에서 무작위로 선택(돌이 있는 매스는 선택되지 않도록 마스크)
+        keys = np.random.random(boards.shape)
+        keys[boards != 0] = -1
+        actions = keys.argmax(axis=1)
+        boards[rows[playing], actions[playing]] = player
+
+        # 이번에 둔 플레이어의 돌 3개 연결 여부를 모든 라인에서 판정
+        win = playing & (boards[:, LINES].sum(axis=2) == 3 * player).any(axis=1)
+        values[win] = player
+        playing &= ~win
+        player = -player
+    return values
+
+
+# 상태의 보드 배열(1: 둘 차례인 플레이어의 돌, -1: 상대의 돌, 0: 빈칸)
+def state_board(state):
+    return np.array(state.pieces, dtype=np.int8) - np.array(state.enemy_pieces, dtype=np.int8)
+
+
+# 상태에서 시작하는 여러 랜덤 플레이아웃의 결과
+def playout_values(state, count=PO_PLAYOUT_COUNT):
+    return random_playouts(np.tile(state_board(state), (count, 1)))
+
+
+# 플레이아웃(여러 플레이아웃의 평균 가치, game.playout()과 같은 형식)
+def batch_playout(state):
+    return float(playout_values(state).mean())
+
+
+# 원시 몬테카를로법을 활용한 행동 선택(모든 합법적인 수의 플레이아웃을 한 번에 실행해 평균 가치 비교)
+def monte_carlo_action(state, count=PO_PLAYOUT_COUNT * 4):
+    # 합법적인 수별로 둔 후의 보드를 상대 기준으로 변환해 count개씩 복사
+    legal_actions = state.legal_actions()
+    board = state_board(state)
+    boards = np.tile(-board, (len(legal_actions), 1))
+    boards[np.arange(len(legal_actions)), legal_actions] = -1
+    values = -random_playouts(np.repeat(boards, count, axis=0)).reshape(len(legal_actions), count).mean(axis=1)
+    return legal_actions[int(np.argmax(values))]
+
+
+# 동작 확인
+if __name__ == '__main__':
+    from game import State, playout, mcts_action
+    import time
+
+    # 초기 국면의 평균 가치 비교
+    state = State()
+    start = time.perf_counter()
+    values = [playout(state) for _ in range(1000)]
+    print('playout {:.3f} ({:.1f} ms)'.format(np.mean(values), (time.perf_counter() - start) * 1000))
+    start = time.perf_counter()
+    values = playout_values(state, 1000)
+    print('playout_values {:.3f} ({:.1f} ms)'.format(values.mean(), (time.perf_counter() - start) * 1000))
+
+    # 행동 선택 1회의 시간 비교
+    for label, action in (('mcts_action', mcts_action),
+                          ('mcts_action(batch_playout)', lambda s: mcts_action(s, batch_playout)),
+                          ('monte_carlo_action', monte_carlo_action)):
+        start = time.perf_counter()
+        action(state)
+        print('{} {:.1f} ms'.format(label, (time.perf_counter() - start) * 1000))
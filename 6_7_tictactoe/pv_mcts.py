@@ -6,31 +6,67 @@
 from game import State
 from dual_network import DN_INPUT_SHAPE
 from math import sqrt
-from tensorflow.keras.models import load_model
 from pathlib import Path
 import numpy as np
 
 # 파라미터 준비
 PV_EVALUATE_COUNT = 50  # 추론 1회당 시뮬레이션 횟수(오리지널: 1600회)
+PV_BATCH_SIZE = 8  # 배치 탐색 시 한 번에 추론할 리프 노드 수
+PV_VIRTUAL_LOSS = 1  # 배치 탐색 시 선택 중인 경로에 더하는 가상 손실
+PV_TRANSPOSITION = False  # 같은 국면의 노드를 공유하는 탐색 사용 여부
+
+
+# 추론 함수 생성(모델 로드 후 1회)
+def inference_function(model):
+    # TensorFlow는 필요할 때만 임포트(넘파이 추론 셀프 플레이 워커는 임포트하지 않음)
+    import tensorflow as tf
+
+    # 넘파이 또는 양자화 네트워크는 그대로 추론 함수로 사용
+    if not isinstance(model, tf.keras.Model):
+        return model
+
+    # 입력 셰이프를 고정해 한 번만 트레이스하는 그래프 함수
+    a, b, c = DN_INPUT_SHAPE
+
+    @tf.function(input_signature=[tf.TensorSpec(shape=(None, a, b, c), dtype=tf.float32)])
+    def call(x):
+        return model(x, training=False)
+
+    # 넘파이 배열로 정책과 가치 반환
+    def infer(x):
+        y = call(tf.convert_to_tensor(x, dtype=tf.float32))
+        return [y[0].numpy(), y[1].numpy()]
+
+    return infer
 
 
 # 추론
 def predict(model, state):
+    return predict_batch(model, [state])[0]
+
+
+# 여러 국면 일괄 추론
+def predict_batch(model, states):
     # 추론을 위한 입력 데이터 셰이프 변환
     a, b, c = DN_INPUT_SHAPE
-    x = np.array([state.pieces, state.enemy_pieces])
-    x = x.reshape(c, a, b).transpose(1, 2, 0).reshape(1, a, b, c)
+    x = np.array([[state.pieces, state.enemy_pieces] for state in states])
+    x = x.reshape(len(states), c, a, b).transpose(0, 2, 3, 1).astype(np.float32)
 
-    # 추론
-    y = model.predict(x, batch_size=1)
+    # 추론(inference_function()으로 생성한 함수 또는 모델 직접 호출)
+    y = model(x)
+    y = [np.asarray(y[0]), np.asarray(y[1])]
 
-    # 정책 얻기
-    policies = y[0][0][list(state.legal_actions())]  # 합법적인 수만
-    policies /= sum(policies) if sum(policies) else 1  # 합계 1의 확률분포로 변환
+    # 국면별 정책과 가치 얻기
+    results = []
+    for i, state in enumerate(states):
+        # 정책 얻기
+        policies = y[0][i][list(state.legal_actions())]  # 합법적인 수만
+        policies /= sum(policies) if sum(policies) else 1  # 합계 1의 확률분포로 변환
 
-    # 가치 얻기
-    value = y[1][0][0]
-    return policies, value
+        # 가치 얻기
+        value = y[1][i][0]
+        results.append((policies, value))
+    return results
 
 
 # 노드 리스트를 시행 횟수 리스트로 변환
@@ -41,90 +77,217 @@ def nodes_to_scores(nodes):
     return scores
 
 
+# 몬테카를로 트리 탐색 노드
+class Node:
+    # 노드 초기화
+    def __init__(self, state):
+        self.state = state  # 상태
+        self.w = 0  # 가치 누계
+        self.n = 0  # 시행 횟수
+        self.child_nodes = None  # 자녀 노드군
+        self.child_policies = None  # 자녀 노드로의 정책
+
+    # 국면 가치 계산
+    def evaluate(self, model, table=None):
+        # 게임 종료 시
+        if self.state.is_done():
+            # 승패 결과로 가치 얻기
+            value = -1 if self.state.is_lose() else 0
+
+            # 누계 가치와 시행 횟수 갱신
+            self.w += value
+            self.n += 1
+            return value
+
+        # 자녀 노드가 존재하지 않는 경우
+        if not self.child_nodes:
+            # 뉴럴 네트워크 추론을 활용한 정책과 가치 얻기
+            policies, value = predict(model, self.state)
+
+            # 누계 가치와 시행 횟수 갱신
+            self.w += value
+            self.n += 1
+
+            # 자녀 노드 전개
+            self.expand(policies, table)
+            return value
+
+        # 자녀 노드가 존재하는 경우
+        else:
+            # 아크 평가값이 가장 큰 자녀 노드의 평가로 가치 얻기
+            value = -self.next_child_node().evaluate(model, table)
+
+            # 누계 가치와 시행 횟수 갱신
+            self.w += value
+            self.n += 1
+            return value
+
+    # 자녀 노드 전개(트랜스포지션 테이블 지정 시 같은 국면의 노드 공유)
+    def expand(self, policies, table=None):
+        self.child_nodes = []
+        self.child_policies = policies
+        for action in self.state.legal_actions():
+            state = self.state.next(action)
+            if table is None:
+                self.child_nodes.append(Node(state))
+                continue
+            key = state_key(state)
+            if key not in table:
+                table[key] = Node(state)
+            self.child_nodes.append(table[key])
+
+    # 아크 평가가 가장 큰 자녀 노드 얻기
+    def next_child_node(self):
+        # 아크 평가 계산
+        C_PUCT = 1.0
+        t = sum(nodes_to_scores(self.child_nodes))
+        pucb_values = []
+        for child_node, p in zip(self.child_nodes, self.child_policies):
+            pucb_values.append((-child_node.w / child_node.n if child_node.n else 0.0) +
+                               C_PUCT * p * sqrt(t) / (1 + child_node.n))
+
+        # 아크 평가값이 가장 큰 자녀 노드 반환
+        return self.child_nodes[np.argmax(pucb_values)]
+
+    # 가상 손실을 더하면서 리프 노드까지의 경로 얻기
+    def select(self):
+        path = [self]
+        while path[-1].child_nodes:
+            path.append(path[-1].next_child_node())
+
+        # 선택 중인 경로를 다른 경로보다 불리하게 보이도록 함
+        for node in path:
+            node.w += PV_VIRTUAL_LOSS
+            node.n += 1
+        return path
+
+
+# 가상 손실을 제거하고 리프 노드의 가치를 경로에 반영
+def backup(path, value):
+    for node in reversed(path):
+        node.w += value - PV_VIRTUAL_LOSS
+        value = -value
+
+
+# 가상 손실만 제거
+def cancel(path):
+    for node in path:
+        node.w -= PV_VIRTUAL_LOSS
+        node.n -= 1
+
+
+# 같은 국면 여부 판정
+def same_state(state0, state1):
+    return state0.pieces == state1.pieces and state0.enemy_pieces == state1.enemy_pieces
+
+
+# 트랜스포지션 테이블의 키
+def state_key(state):
+    return state.zobrist
+
+
+# 수를 둔 뒤에도 탐색 결과를 유지하는 탐색 트리
+class SearchTree:
+    # 초기화
+    def __init__(self, model, batch_size=1, transposition=PV_TRANSPOSITION):
+        self.model = model  # 추론 함수
+        self.batch_size = batch_size  # 한 번에 추론할 리프 노드 수
+        self.root_node = None  # 루트 노드
+        self.table = {} if transposition else None  # 트랜스포지션 테이블(국면 키 → 노드)
+
+    # 루트 노드 얻기
+    def find_root_node(self, state):
+        # 이전 루트 노드부터 2수 앞(자신의 수와 상대의 수)까지 같은 국면을 탐색
+        nodes = [self.root_node] if self.root_node else []
+        for _ in range(3):
+            for node in nodes:
+                if same_state(node.state, state):
+                    return node  # 자녀 노드를 새 루트 노드로 승격
+            nodes = [c for node in nodes if node.child_nodes for c in node.child_nodes]
+
+        # 탐색 트리에 없는 국면인 경우 새로 생성
+        node = Node(state)
+        if self.table is not None:
+            self.table.clear()
+            self.table[state_key(state)] = node
+        return node
+
+    # 탐색 실행
+    def search(self, state):
+        # 현재 국면의 노드 얻기
+        self.root_node = self.find_root_node(state)
+
+        # 여러 차례 평가 실행
+        if self.batch_size <= 1:
+            for _ in range(PV_EVALUATE_COUNT):
+                self.root_node.evaluate(self.model, self.table)
+        else:
+            self.evaluate_batch()
+
+        # 시행 횟수 리스트 반환
+        return nodes_to_scores(self.root_node.child_nodes)
+
+    # 여러 경로를 동시에 내려가 리프 노드를 한 번에 평가
+    def evaluate_batch(self):
+        count = 0
+        while count < PV_EVALUATE_COUNT:
+            # 리프 노드 수집
+            paths = []
+            for _ in range(min(self.batch_size, PV_EVALUATE_COUNT - count)):
+                path = self.root_node.select()
+                leaf_node = path[-1]
+
+                # 게임 종료 시 승패 결과를 바로 반영
+                if leaf_node.state.is_done():
+                    backup(path, -1 if leaf_node.state.is_lose() else 0)
+                    count += 1
+                    continue
+
+                # 이미 수집한 리프 노드에 도달한 경우 수집 종료
+                if any(leaf_node is p[-1] for p in paths):
+                    cancel(path)
+                    break
+                paths.append(path)
+
+            # 수집한 리프 노드를 한 번에 추론
+            if not paths:
+                continue
+            results = predict_batch(self.model, [path[-1].state for path in paths])
+
+            # 자녀 노드 전개와 가치 반영
+            for path, (policies, value) in zip(paths, results):
+                path[-1].expand(policies, self.table)
+                backup(path, value)
+                count += 1
+
+    # 몬테카를로 트리 탐색 스코어 얻기
+    def scores(self, state, temperature):
+        # 합법적인 수의 확률 분포
+        scores = self.search(state)
+        if temperature == 0:  # 최대값인 경우에만 1
+            action = np.argmax(scores)
+            scores = np.zeros(len(scores))
+            scores[action] = 1
+        else:  # 볼츠만 분포를 기반으로 분산 추가
+            scores = boltzman(scores, temperature)
+        return scores
+
+
 # 몬테카를로 트리 탐색 스코어 얻기
-def pv_mcts_scores(model, state, temperature):
-    # 몬테카를로 트리 탐색 노드 정의
-    class Node:
-        # 노드 초기화
-        def __init__(self, state, p):
-            self.state = state  # 상태
-            self.p = p  # 정책
-            self.w = 0  # 가치 누계
-            self.n = 0  # 시행 횟수
-            self.child_nodes = None  # 자녀 노드군
-
-        # 국면 가치 계산
-        def evaluate(self):
-            # 게임 종료 시
-            if self.state.is_done():
-                # 승패 결과로 가치 얻기
-                value = -1 if self.state.is_lose() else 0
-
-                # 누계 가치와 시행 횟수 갱신
-                self.w += value
-                self.n += 1
-                return value
-
-            # 자녀 노드가 존재하지 않는 경우
-            if not self.child_nodes:
-                # 뉴럴 네트워크 추론을 활용한 정책과 가치 얻기
-                policies, value = predict(model, self.state)
-
-                # 누계 가치와 시행 횟수 갱신
-                self.w += value
-                self.n += 1
-
-                # 자녀 노드 전개
-                self.child_nodes = []
-                for action, policy in zip(self.state.legal_actions(), policies):
-                    self.child_nodes.append(Node(self.state.next(action), policy))
-                return value
-
-            # 자녀 노드가 존재하지 않는 경우
-            else:
-                # 아크 평가값이 가장 큰 자녀 노드의 평가로 가치 얻기
-                value = -self.next_child_node().evaluate()
-
-                # 누계 가치와 시행 횟수 갱신
-                self.w += value
-                self.n += 1
-                return value
-
-        # 아크 평가가 가장 큰 자녀 노드 얻기
-        def next_child_node(self):
-            # 아크 평가 계산
-            C_PUCT = 1.0
-            t = sum(nodes_to_scores(self.child_nodes))
-            pucb_values = []
-            for child_node in self.child_nodes:
-                pucb_values.append((-child_node.w / child_node.n if child_node.n else 0.0) +
-                                   C_PUCT * child_node.p * sqrt(t) / (1 + child_node.n))
-
-            # 아크 평가값이 가장 큰 자녀 노드 반환
-            return self.child_nodes[np.argmax(pucb_values)]
-
-    # 현재 국면의 노드 생성
-    root_node = Node(state, 0)
-
-    # 여러 차례 평가 실행
-    for _ in range(PV_EVALUATE_COUNT):
-        root_node.evaluate()
-
-    # 합법적인 수의 확률 분포
-    scores = nodes_to_scores(root_node.child_nodes)
-    if temperature == 0:  # 최대값인 경우에만 1
-        action = np.argmax(scores)
-        scores = np.zeros(len(scores))
-        scores[action] = 1
-    else:  # 볼츠만 분포를 기반으로 분산 추가
-        scores = boltzman(scores, temperature)
-    return scores
+def pv_mcts_scores(model, state, temperature, batch_size=1):
+    return SearchTree(model, batch_size).scores(state, temperature)
 
 
 # 몬테카를로 트리 탐색을 활용한 행동 선택
-def pv_mcts_action(model, temperature=0):
+def pv_mcts_action(model, temperature=0, batch_size=1):
+    # 추론 함수 생성
+    infer = inference_function(model)
+
+    # 이전 수의 탐색 결과를 재사용하는 탐색 트리
+    tree = SearchTree(infer, batch_size)
+
     def pv_mcts_action(state):
-        scores = pv_mcts_scores(model, state, temperature)
+        scores = tree.scores(state, temperature)
         return np.random.choice(state.legal_actions(), p=scores)
 
     return pv_mcts_action
@@ -138,6 +301,8 @@ def boltzman(xs, temperature):
 
 # 동작 확인
 if __name__ == '__main__':
+    from tensorflow.keras.models import load_model
+
     # 모델 로드
     path = sorted(Path('./model').glob('*.h5'))[-1]
     model = load_model(str(path))
@@ -0,0 +1,140 @@
+# ====================
+# 배열 기반 몬테카를로 트리 탐색
+# ====================
+
+# 패키지 임포트
+from game import State
+from dual_network import DN_OUTPUT_SIZE
+from pv_mcts import predict, inference_function, boltzman, PV_EVALUATE_COUNT
+from math import sqrt
+from pathlib import Path
+import numpy as np
+
+# 파라미터 준비
+C_PUCT = 1.0  # 아크 평가의 탐색 계수
+
+
+# 노드 번호로 통계를 관리하는 탐색 트리
+class ArrayTree:
+    # 초기화
+    def __init__(self, state, evaluate_count=PV_EVALUATE_COUNT):
+        # 전개 1회당 자녀 노드는 최대 DN_OUTPUT_SIZE개
+        capacity = 1 + evaluate_count * DN_OUTPUT_SIZE
+
+        # 노드 번호로 인덱싱하는 배열
+        self.n = np.zeros(capacity, dtype=np.int32)  # 시행 횟수
+        self.w = np.zeros(capacity, dtype=np.float32)  # 가치 누계
+        self.p = np.zeros(capacity, dtype=np.float32)  # 정책
+        self.action = np.zeros(capacity, dtype=np.int16)  # 부모 노드에서의 행동
+        self.child_start = np.full(capacity, -1, dtype=np.int32)  # 첫 자녀 노드 번호(-1: 미전개)
+        self.child_count = np.zeros(capacity, dtype=np.int16)  # 자녀 노드 수
+
+        # 상태는 평가한 노드만 보관
+        self.states = {0: state}
+        self.size = 1  # 사용 중인 노드 수
+
+    # 노드 1개당 배열의 바이트 수
+    def node_bytes(self):
+        return sum(a.itemsize for a in (self.n, self.w, self.p, self.action, self.child_start, self.child_count))
+
+    # 아크 평가가 가장 큰 자녀 노드 번호 얻기
+    def next_child_node(self, node):
+        s = self.child_start[node]
+        e = s + self.child_count[node]
+        n = self.n[s:e]
+        q = -self.w[s:e] / np.maximum(n, 1)  # 시행 횟수 0인 노드는 0
+        u = C_PUCT * self.p[s:e] * sqrt(n.sum()) / (1 + n)
+        return s + int(np.argmax(q + u))
+
+    # 자녀 노드 전개
+    def expand(self, node, state, policies):
+        legal_actions = state.legal_actions()
+        s = self.size
+        e = s + len(legal_actions)
+        self.action[s:e] = legal_actions
+        self.p[s:e] = policies
+        self.child_start[node] = s
+        self.child_count[node] = len(legal_actions)
+        self.size = e
+
+    # 시뮬레이션 1회 실행
+    def evaluate(self, model):
+        # 리프 노드까지 이동
+        path = [0]
+        while self.child_start[path[-1]] >= 0:
+            path.append(self.next_child_node(path[-1]))
+        node = path[-1]
+
+        # 리프 노드의 상태 얻기
+        state = self.states.get(node)
+        if state is None:
+            state = self.states[path[-2]].next(int(self.action[node]))
+            self.states[node] = state
+
+        # 게임 종료 시 승패 결과로 가치 얻기
+        if state.is_done():
+            value = -1 if state.is_lose() else 0
+
+        # 뉴럴 네트워크 추론을 활용한 정책과 가치 얻기
+        else:
+            policies, value = predict(model, state)
+            self.expand(node, state, policies)
+
+        # 경로의 누계 가치와 시행 횟수 갱신(리프 노드부터 부호 교대)
+        signs = np.where(np.arange(len(path))[::-1] % 2 == 0, 1.0, -1.0)
+        self.w[path] += value * signs
+        self.n[path] += 1
+
+    # 루트 노드의 자녀 노드 시행 횟수
+    def scores(self):
+        s = self.child_start[0]
+        return self.n[s:s + self.child_count[0]].tolist()
+
+
+# 몬테카를로 트리 탐색 스코어 얻기
+def pv_mcts_array_scores(model, state, temperature, evaluate_count=PV_EVALUATE_COUNT):
+    # 여러 차례 평가 실행
+    tree = ArrayTree(state, evaluate_count)
+    for _ in range(evaluate_count):
+        tree.evaluate(model)
+
+    # 합법적인 수의 확률 분포
+    scores = tree.scores()
+    if temperature == 0:  # 최대값인 경우에만 1
+        action = np.argmax(scores)
+        scores = np.zeros(len(scores))
+        scores[action] = 1
+    else:  # 볼츠만 분포를 기반으로 분산 추가
+        scores = boltzman(scores, temperature)
+    return scores
+
+
+# 몬테카를로 트리 탐색을 활용한 행동 선택
+def pv_mcts_array_action(model, temperature=0, evaluate_count=PV_EVALUATE_COUNT):
+    # 추론 함수 생성
+    infer = inference_function(model)
+
+    def pv_mcts_array_action(state):
+        scores = pv_mcts_array_scores(infer, state, temperature, evaluate_count)
+        return np.random.choice(state.legal_actions(), p=scores)
+
+    return pv_mcts_array_action
+
+
+# 동작 확인
+if __name__ == '__main__':
+    from tensorflow.keras.models import load_model
+
+    # 모델 로드
+    path = sorted(Path('./model').glob('*.h5'))[-1]
+    model = load_model(str(path))
+
+    # 오리지널과 같은 1600회 시뮬레이션으로 탐색
+    tree = ArrayTree(State(), 1600)
+    infer = inference_function(model)
+    for _ in range(1600):
+        tree.evaluate(infer)
+
+    # 탐색 결과 표시
+    print('scores', tree.scores())
+    print('nodes', tree.size, 'bytes/node', tree.node_bytes())
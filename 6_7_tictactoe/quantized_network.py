@@ -0,0 +1,144 @@
+# ====================
+# int8 양자화 듀얼 네트워크 추론
+# ====================
+
+# 패키지 임포트
+from game import State, random_action
+from dual_network import DN_INPUT_SHAPE
+from folded_network import folded_network
+from training_data import read_arrays, TD_SUFFIX
+from pathlib import Path
+import tensorflow as tf
+import numpy as np
+import time
+import os
+
+# 파라미터 준비
+QN_CALIBRATION_FILES = 10  # 캘리브레이션에 사용할 최근 학습 데이터 파일 수
+QN_CALIBRATION_POSITIONS = 500  # 캘리브레이션에 사용할 국면 수
+QN_THREADS = 1  # 인터프리터 1개당 스레드 수(워커 프로세스별로 코어를 나눠 씀)
+
+
+# 캘리브레이션용 국면 얻기(최근 학습 데이터에서 무작위 추출)
+def calibration_positions(count=QN_CALIBRATION_POSITIONS):
+    xs = []
+    for path in sorted(Path('./data').glob('*' + TD_SUFFIX))[-QN_CALIBRATION_FILES:]:
+        xs.append(np.asarray(read_arrays(path)[0]))
+
+    # 학습 데이터가 없는 경우 무작위 게임의 국면 사용
+    if not xs:
+        return random_positions(count)
+    xs = np.concatenate(xs)
+    return xs[np.random.choice(len(xs), min(count, len(xs)), replace=False)].astype(np.float32)
+
+
+# 무작위 게임의 국면 얻기
+def random_positions(count):
+    a, b, c = DN_INPUT_SHAPE
+    xs = []
+    while len(xs) < count:
+        state = State()
+        while not state.is_done() and len(xs) < count:
+            xs.append([state.pieces, state.enemy_pieces])
+            state = state.next(random_action(state))
+    return np.array(xs).reshape(count, c, a, b).transpose(0, 2, 3, 1).astype(np.float32)
+
+
+# 모델을 int8 양자화 모델로 변환
+def convert_quantized(model):
+    # 배치 정규화를 합친 모델을 변환(입출력은 float32 그대로)
+    converter = tf.lite.TFLiteConverter.from_keras_model(folded_network(model))
+    converter.optimizations = [tf.lite.Optimize.DEFAULT]
+    converter.target_spec.supported_ops = [tf.lite.OpsSet.TFLITE_BUILTINS_INT8]
+
+    # 학습 데이터의 국면으로 활성화의 범위 캘리브레이션
+    xs = calibration_positions()
+    converter.representative_dataset = lambda: ([x[np.newaxis]] for x in xs)
+    return converter.convert()
+
+
+# 모델 파일을 int8 양자화 모델 파일로 변환
+def export_quantized(model_path='./model/best.h5', path='./model/best.tflite'):
+    data = convert_quantized(tf.keras.models.load_model(model_path))
+
+    # 임시 파일에 저장한 후 교체(여러 프로세스가 동시에 변환해도 완성된 파일만 보이도록)
+    temp_path = path.replace('.tflite', '.{}.tmp.tflite'.format(os.getpid()))
+    with open(temp_path, mode='wb') as f:
+        f.write(data)
+    os.replace(temp_path, path)
+
+
+# 양자화 모델 파일 로드(모델 파일보다 오래된 경우 다시 변환)
+def load_quantized_network(model_path='./model/best.h5', path=None):
+    path = path or model_path.replace('.h5', '.tflite')
+    if not os.path.exists(path) or os.path.getmtime(path) < os.path.getmtime(model_path):
+        export_quantized(model_path, path)
+    return QuantizedNetwork(path)
+
+
+# 상주 모델을 파일을 거치지 않고 양자화 듀얼 네트워크로 변환
+def quantized_network(model):
+    return QuantizedNetwork(content=convert_quantized(model))
+
+
+# TFLite 인터프리터로 추론하는 양자화 듀얼 네트워크
+class QuantizedNetwork:
+    # 초기화(path: 모델 파일, content: 변환한 모델 데이터)
+    def __init__(self, path=None, content=None):
+        self.interpreter = tf.lite.Interpreter(model_path=path, model_content=content, num_threads=QN_THREADS)
+        self.input = self.interpreter.get_input_details()[0]['index']
+
+        # 출력 순서는 변환기가 정하므로 크기로 policy와 value 구분
+        outputs = sorted(self.interpreter.get_output_details(), key=lambda d: -d['shape'][-1])
+        self.outputs = [d['index'] for d in outputs]
+        self.batch_size = None
+
+    # 추론(inference_function()으로 생성한 함수와 같은 형식)
+    def __call__(self, x):
+        x = np.asarray(x, dtype=np.float32)
+
+        # 배치 크기가 바뀐 경우에만 텐서 다시 할당
+        if len(x) != self.batch_size:
+            self.interpreter.resize_tensor_input(self.input, x.shape)
+            self.interpreter.allocate_tensors()
+            self.batch_size = len(x)
+
+        self.interpreter.set_tensor(self.input, x)
+        self.interpreter.invoke()
+        return [self.interpreter.get_tensor(i).copy() for i in self.outputs]
+
+
+# 양자화 모델과 float 모델의 출력 차이 보고
+def drift_report(model_path='./model/best.h5'):
+    from pv_mcts import inference_function
+
+    # 두 모델로 같은 국면 추론
+    infer = inference_function(folded_network(tf.keras.models.load_model(model_path)))
+    network = load_quantized_network(model_path)
+    xs = calibration_positions()
+    p0, v0 = infer(xs)
+    p1, v1 = network(xs)
+
+    # policy 차이(최대, 평균, 최선수 일치율, 양자화로 합계가 1에서 벗어난 분포를 정규화한 KL 발산)
+    q = p1 / p1.sum(axis=1, keepdims=True)
+    kl = np.sum(p0 * (np.log(p0 + 1e-8) - np.log(q + 1e-8)), axis=1)
+    print('positions', len(xs))
+    print('policy max abs diff {:.4f} mean {:.4f}'.format(np.abs(p0 - p1).max(), np.abs(p0 - p1).mean()))
+    print('policy top-1 agreement {:.1%} KL mean {:.5f}'.format(
+        np.mean(p0.argmax(axis=1) == p1.argmax(axis=1)), kl.mean()))
+
+    # value 차이(최대, 평균, 부호 일치율)
+    print('value max abs diff {:.4f} mean {:.4f} sign agreement {:.1%}'.format(
+        np.abs(v0 - v1).max(), np.abs(v0 - v1).mean(), np.mean(np.sign(v0) == np.sign(v1))))
+
+    # 1국면 추론 속도
+    for name, f in (('float', infer), ('int8', network)):
+        start = time.perf_counter()
+        for x in xs[:200]:
+            f(x[np.newaxis])
+        print('{} {:.0f} positions/s'.format(name, min(200, len(xs)) / (time.perf_counter() - start)))
+
+
+# 동작 확인
+if __name__ == '__main__':
+    drift_report()
@@ -0,0 +1,131 @@
+# ====================
+# 틱택토 완전 해석 테이블
+# ====================
+
+# 패키지 임포트
+from game import State
+import numpy as np
+import os
+
+# 파라미터 준비
+TB_PATH = './model/tablebase.npy'  # 테이블 파일 경로
+
+# 로드한 테이블([국면 코드] → (상태 가치, 최선수의 비트 마스크))
+tablebase = None
+
+
+# 국면 코드 얻기(매스별로 0: 빈칸, 1: 둘 차례인 플레이어의 돌, 2: 상대의 돌인 3진수)
+def position_code(state):
+    code = 0
+    for i in reversed(range(9)):
+        code = code * 3 + state.pieces[i] + state.enemy_pieces[i] * 2
+    return code
+
+
+# 국면 코드를 상태로 변환
+def code_to_state(code):
+    pieces, enemy_pieces = [0] * 9, [0] * 9
+    for i in range(9):
+        code, piece = divmod(code, 3)
+        pieces[i] = 1 if piece == 1 else 0
+        enemy_pieces[i] = 1 if piece == 2 else 0
+    return State(pieces, enemy_pieces)
+
+
+# 도달 가능한 모든 국면을 열거해 테이블 생성
+def build_tablebase():
+    # 도달하지 않는 국면은 상태 가치 0, 최선수 없음
+    table = np.zeros((3 ** 9, 2), dtype=np.int16)
+    solved = np.zeros(3 ** 9, dtype=bool)
+
+    # 상태 가치 계산(한 번 계산한 국면은 테이블 참조)
+    def solve(state):
+        code = position_code(state)
+        if solved[code]:
+            return table[code, 0]
+
+        # 패배 시 -1, 무승부 시 0
+        if state.is_lose():
+            value, mask = -1, 0
+        elif state.is_draw():
+            value, mask = 0, 0
+
+        # 상태 가치가 최대인 합법적인 수를 모두 최선수로 기록
+        else:
+            scores = {action: -solve(state.next(action)) for action in state.legal_actions()}
+            value = max(scores.values())
+            mask = sum(1 << action for action, score in scores.items() if score == value)
+
+        table[code] = value, mask
+        solved[code] = True
+        return value
+
+    solve(State())
+    return table
+
+
+# 테이블 저장(임시 파일에 저장한 후 교체)
+def save_tablebase(table, path=TB_PATH):
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    temp_path = path.replace('.npy', '.{}.tmp.npy'.format(os.getpid()))
+    np.save(temp_path, table)
+    os.replace(temp_path, path)
+
+
+# 테이블 로드(파일이 없는 경우 생성해 저장, 복사하지 않고 메모리 맵으로 참조)
+def load_tablebase(path=TB_PATH):
+    global tablebase
+    if tablebase is None:
+        if not os.path.exists(path):
+            save_tablebase(build_tablebase(), path)
+        tablebase = np.load(path, mmap_mode='r')
+    return tablebase
+
+
+# 국면의 상태 가치(1: 승리, 0: 무승부, -1: 패배)
+def tablebase_value(state):
+    return int(load_tablebase()[position_code(state), 0])
+
+
+# 테이블을 활용한 행동 선택(알파베타법의 탐색 순서와 같이 최선수 중 가장 작은 행동)
+def tablebase_action(state):
+    mask = int(load_tablebase()[position_code(state), 1])
+    return (mask & -mask).bit_length() - 1
+
+
+# 듀얼 네트워크의 value 출력과 policy 출력의 정확도 계산
+def network_accuracy(model_path='./model/best.h5'):
+    from dual_network import DN_INPUT_SHAPE
+    from folded_network import load_inference_model
+    from pv_mcts import inference_function
+
+    # 게임이 끝나지 않은 도달 가능한 모든 국면
+    table = load_tablebase()
+    codes = np.flatnonzero(table[:, 1])
+    states = [code_to_state(code) for code in codes]
+
+    # 모든 국면을 일괄 추론
+    a, b, c = DN_INPUT_SHAPE
+    x = np.array([[state.pieces, state.enemy_pieces] for state in states])
+    x = x.reshape(len(states), c, a, b).transpose(0, 2, 3, 1).astype(np.float32)
+    policies, values = inference_function(load_inference_model(model_path))(x)
+    values = values[:, 0]
+
+    # value 출력을 -1/3, 1/3을 경계로 패배, 무승부, 승리로 분류
+    truth = table[codes, 0].astype(np.int64)
+    predicted = np.digitize(values, [-1 / 3, 1 / 3]) - 1
+    print('positions', len(codes))
+    print('value accuracy {:.1%} mse {:.4f}'.format(
+        np.mean(predicted == truth), np.mean((values - truth) ** 2)))
+    for t, label in ((1, 'win'), (0, 'draw'), (-1, 'lose')):
+        counts = [np.sum((truth == t) & (predicted == p)) for p in (1, 0, -1)]
+        print('  {:<4} {:>5} -> win {:>5} draw {:>5} lose {:>5}'.format(label, np.sum(truth == t), *counts))
+
+    # policy 출력의 최대 확률 행동이 최선수인 비율
+    masks = table[codes, 1].astype(np.int64)
+    print('policy best move rate {:.1%}'.format(np.mean((masks >> policies.argmax(axis=1)) & 1)))
+
+
+# 동작 확인
+if __name__ == '__main__':
+    network_accuracy()
@@ -9,20 +9,22 @@ from train_network import train_network
 from evaluate_network import evaluate_network
 from evaluate_best_player import evaluate_best_player
 
-# 듀얼 네트워크 생성
-dual_network()
+# 동작 확인(셀프 플레이 워커 프로세스가 다시 실행하지 않도록 보호)
+if __name__ == '__main__':
+    # 듀얼 네트워크 생성
+    dual_network()
 
-for i in range(10):
-    print('Train', i, '====================')
-    # 셀프 플레이 파트
-    self_play()
+    for i in range(10):
+        print('Train', i, '====================')
+        # 셀프 플레이 파트
+        self_play()
 
-    # 파라미터 갱신 파트
-    train_network()
+        # 파라미터 갱신 파트
+        train_network()
 
-    # 신규 파라미터 평가 파트
-    update_best_player = evaluate_network()
+        # 신규 파라미터 평가 파트
+        update_best_player = evaluate_network()
 
-    # 베스트 플레이어 평가
-    if update_best_player:
-        evaluate_best_player()
\ No newline at end of file
+        # 베스트 플레이어 평가
+        if update_best_player:
+            evaluate_best_player()
@@ -0,0 +1,81 @@
+# ====================
+# 학습 데이터 파일
+# ====================
+
+# 패키지 임포트
+from dual_network import DN_INPUT_SHAPE
+from pathlib import Path
+import numpy as np
+import pickle
+import sys
+import os
+
+# 파라미터 준비
+TD_SUFFIX = '.positions'  # 학습 데이터 파일 확장자
+
+
+# 학습 데이터를 열 단위 배열로 변환
+def history_to_arrays(history):
+    xs, policies, values = zip(*history)
+
+    # 입력 데이터는 듀얼 네트워크 입력 셰이프의 uint8
+    a, b, c = DN_INPUT_SHAPE
+    xs = np.array(xs, dtype=np.uint8)
+    xs = xs.reshape(len(xs), c, a, b).transpose(0, 2, 3, 1)
+
+    # 정책은 float16, 가치는 int8
+    policies = np.array(policies, dtype=np.float16)
+    values = np.array(values, dtype=np.int8)
+    return xs, policies, values
+
+
+# 학습 데이터 저장(.npy 형식의 헤더와 배열 3개를 이어서 기록)
+def write_arrays(path, arrays):
+    # 임시 파일에 기록한 후 교체(기록 중인 파일을 학습 프로세스가 읽지 않도록)
+    temp_path = str(path) + '.tmp'
+    with open(temp_path, mode='wb') as f:
+        for array in arrays:
+            np.lib.format.write_array(f, np.ascontiguousarray(array), allow_pickle=False)
+    os.replace(temp_path, path)
+
+
+# 학습 데이터 로드(복사하지 않고 메모리 맵으로 참조)
+def read_arrays(path):
+    arrays = []
+    with open(path, mode='rb') as f:
+        for _ in range(3):
+            # 헤더 읽기
+            version = np.lib.format.read_magic(f)
+            if version == (1, 0):
+                shape, fortran_order, dtype = np.lib.format.read_array_header_1_0(f)
+            else:
+                shape, fortran_order, dtype = np.lib.format.read_array_header_2_0(f)
+
+            # 헤더 뒤의 배열을 메모리 맵으로 참조
+            offset = f.tell()
+            if len(shape) == 0 or shape[0] == 0:
+                arrays.append(np.zeros(shape, dtype=dtype))
+            else:
+                arrays.append(np.memmap(path, dtype=dtype, mode='r', offset=offset, shape=shape))
+            f.seek(offset + int(np.prod(shape)) * dtype.itemsize)
+    return arrays
+
+
+# 기존 .history 파일을 학습 데이터 파일로 변환
+def convert_history(history_path):
+    history_path = Path(history_path)
+    with history_path.open(mode='rb') as f:
+        history = pickle.load(f)
+    path = history_path.with_suffix(TD_SUFFIX)
+    write_arrays(path, history_to_arrays(history))
+    return path
+
+
+# 동작 확인(python training_data.py [.history 파일 ...])
+if __name__ == '__main__':
+    # 인수가 없으면 ./data의 모든 .history 파일 변환
+    history_paths = sys.argv[1:] or sorted(Path('./data').glob('*.history'))
+    for history_path in history_paths:
+        path = convert_history(history_path)
+        print('{} -> {} ({} -> {} bytes)'.format(
+            history_path, path, Path(history_path).stat().st_size, path.stat().st_size))
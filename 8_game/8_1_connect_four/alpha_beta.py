@@ -0,0 +1,220 @@
+# ====================
+# 치환표와 반복 심화를 활용한 알파베타법
+# ====================
+
+# 패키지 임포트
+from game import State, random_action, BOTTOM_MASK
+import time
+
+# 파라미터 준비
+AB_NODE_LIMIT = 200000  # 행동 선택 1회당 탐색 노드 수 상한(None: 제한 없음)
+AB_TIME_LIMIT = 1.0  # 행동 선택 1회당 탐색 시간 상한(초, None: 제한 없음)
+AB_MAX_DEPTH = 64  # 반복 심화의 최대 깊이
+AB_TABLE_CAPACITY = 1000000  # 치환표 최대 항목 수(넘으면 비움)
+AB_MATE = 1000  # 승패가 정해진 국면의 스코어(빨리 이길수록 큼)
+BOARD_MASK = BOTTOM_MASK * ((1 << 6) - 1)  # 보드의 모든 칸(각 열의 아래 6칸)
+
+# 치환표 항목의 스코어 종류
+EXACT, LOWER, UPPER = 0, 1, 2
+
+
+# 탐색 예산 초과
+class SearchTimeout(Exception):
+    pass
+
+
+# 4개를 연결할 수 있는 빈칸의 비트보드
+def winning_squares(position, mask):
+    # 세로(아래 3개가 연결된 칸)
+    r = (position << 1) & (position << 2) & (position << 3)
+
+    # 가로, 대각선 2방향(양쪽의 연결 3개 중 빈칸 1개)
+    for d in (7, 6, 8):
+        p = (position << d) & (position << 2 * d)
+        r |= p & (position << 3 * d)
+        r |= p & (position >> d)
+        p = (position >> d) & (position >> 2 * d)
+        r |= p & (position << d)
+        r |= p & (position >> 3 * d)
+    return r & BOARD_MASK & ~mask
+
+
+# 평가 함수(4개를 연결할 수 있는 빈칸 수의 차)
+def evaluate_state(state):
+    enemy = state.position ^ state.mask
+    own = bin(winning_squares(state.position, state.mask)).count('1')
+    other = bin(winning_squares(enemy, state.mask)).count('1')
+    return (own - other) / (own + other + 4)
+
+
+# 듀얼 네트워크의 value 출력을 평가 함수로 사용
+def network_evaluator(model):
+    from pv_mcts import inference_function, predict
+    infer = inference_function(model)
+    return lambda state: predict(infer, state)[1]
+
+
+# 승패 스코어를 루트 기준에서 국면 기준으로 변환(치환표 저장용)
+def to_table_score(score, ply):
+    if score > AB_MATE / 2:
+        return score + ply
+    if score < -AB_MATE / 2:
+        return score - ply
+    return score
+
+
+# 승패 스코어를 국면 기준에서 루트 기준으로 변환(치환표 참조용)
+def from_table_score(score, ply):
+    if score > AB_MATE / 2:
+        return score - ply
+    if score < -AB_MATE / 2:
+        return score + ply
+    return score
+
+
+# 알파베타법 탐색기
+class AlphaBeta:
+    # 초기화(evaluate: 국면 → -1~1의 상태 가치)
+    def __init__(self, evaluate=evaluate_state, node_limit=AB_NODE_LIMIT, time_limit=AB_TIME_LIMIT,
+                 max_depth=AB_MAX_DEPTH):
+        self.evaluate = evaluate
+        self.node_limit = node_limit
+        self.time_limit = time_limit
+        self.max_depth = max_depth
+        self.table = {}  # 조브리스트 해시 → (깊이, 스코어, 스코어 종류, 최선수)
+        self.killers = []  # 깊이별로 베타 컷을 일으킨 행동 2개
+        self.history = {}  # 행동별 베타 컷 기여도
+        self.nodes = 0  # 탐색한 노드 수
+        self.deadline = None
+
+    # 행동 선택(반복 심화로 예산 안에서 끝까지 탐색한 가장 깊은 결과 반환)
+    def search(self, state):
+        # 치환표는 이전 탐색 결과를 재사용하고, 너무 커지면 비움
+        if len(self.table) > AB_TABLE_CAPACITY:
+            self.table.clear()
+        self.history.clear()
+        self.nodes = 0
+        self.deadline = None if self.time_limit is None else time.perf_counter() + self.time_limit
+
+        best_action, best_score, best_depth = state.legal_actions()[0], 0, 0
+        for depth in range(1, self.max_depth + 1):
+            try:
+                score = self.negamax(state, depth, -AB_MATE - 1, AB_MATE + 1, 0)
+            except SearchTimeout:
+                break
+            best_action, best_score, best_depth = self.table[state.zobrist][3], score, depth
+
+            # 승패가 정해진 경우 더 깊이 탐색할 필요 없음
+            if abs(score) > AB_MATE / 2:
+                break
+        return best_action, best_score, best_depth
+
+    # 행동 정렬(치환표의 최선수, 킬러 수, 히스토리 순)
+    def ordered_actions(self, state, ply, table_action):
+        actions = state.legal_actions()
+        killers = self.killers[ply] if ply < len(self.killers) else ()
+
+        def priority(action):
+            if action == table_action:
+                return 2, 0
+            if action in killers:
+                return 1, 0
+            return 0, self.history.get(action, 0)
+
+        return sorted(actions, key=priority, reverse=True)
+
+    # 베타 컷을 일으킨 행동 기록
+    def record_cutoff(self, action, depth, ply):
+        while len(self.killers) <= ply:
+            self.killers.append([None, None])
+        killers = self.killers[ply]
+        if killers[0] != action:
+            killers[1], killers[0] = killers[0], action
+        self.history[action] = self.history.get(action, 0) + depth * depth
+
+    # 네가맥스 탐색(ply: 루트로부터의 깊이)
+    def negamax(self, state, depth, alpha, beta, ply):
+        # 예산 초과 시 이번 반복 중단(시간은 1024노드마다 확인)
+        self.nodes += 1
+        if self.node_limit is not None and self.nodes > self.node_limit:
+            raise SearchTimeout()
+        if self.deadline is not None and self.nodes % 1024 == 0 and time.perf_counter() > self.deadline:
+            raise SearchTimeout()
+
+        # 패배 시 빨리 질수록 작은 스코어, 무승부 시 0
+        if state.is_lose():
+            return -AB_MATE + ply
+        if state.is_draw():
+            return 0
+
+        # 탐색 깊이에 도달하면 평가 함수로 평가
+        if depth == 0:
+            return self.evaluate(state)
+
+        # 치환표 참조(같은 깊이 이상으로 탐색한 결과면 스코어 범위를 좁힘)
+        alpha_orig = alpha
+        entry = self.table.get(state.zobrist)
+        table_action = None
+        if entry is not None:
+            table_action = entry[3]
+            if entry[0] >= depth:
+                score = from_table_score(entry[1], ply)
+                if entry[2] == EXACT:
+                    return score
+                if entry[2] == LOWER:
+                    alpha = max(alpha, score)
+                else:
+                    beta = min(beta, score)
+                if alpha >= beta:
+                    return score
+
+        # 합법적인 수의 상태 가치 계산
+        best_score, best_action = -AB_MATE - 1, None
+        for action in self.ordered_actions(state, ply, table_action):
+            score = -self.negamax(state.next(action), depth - 1, -beta, -alpha, ply + 1)
+            if score > best_score:
+                best_score, best_action = score, action
+            if score > alpha:
+                alpha = score
+
+            # 현재 노드의 베스트 스코어가 부모 노드보다 크면 탐색 종료
+            if alpha >= beta:
+                self.record_cutoff(action, depth, ply)
+                break
+
+        # 치환표 저장
+        if best_score <= alpha_orig:
+            flag = UPPER
+        elif best_score >= beta:
+            flag = LOWER
+        else:
+            flag = EXACT
+        self.table[state.zobrist] = (depth, to_table_score(best_score, ply), flag, best_action)
+        return best_score
+
+
+# 알파베타법을 활용한 행동 선택 함수 생성(치환표는 같은 함수의 호출끼리 공유)
+def alpha_beta_search_action(evaluate=evaluate_state, node_limit=AB_NODE_LIMIT, time_limit=AB_TIME_LIMIT):
+    searcher = AlphaBeta(evaluate, node_limit, time_limit)
+
+    def alpha_beta_search_action(state):
+        return searcher.search(state)[0]
+
+    return alpha_beta_search_action
+
+
+# 동작 확인
+if __name__ == '__main__':
+    # 알파베타법과 랜덤의 대전
+    searcher = AlphaBeta()
+    state = State()
+    while not state.is_done():
+        if state.is_first_player():
+            start = time.perf_counter()
+            action, score, depth = searcher.search(state)
+            print('action {} score {} depth {} nodes {} {:.2f}s'.format(
+                action, score, depth, searcher.nodes, time.perf_counter() - start))
+        else:
+            action = random_action(state)
+        state = state.next(action)
+        print(state)
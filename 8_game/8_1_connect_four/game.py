@@ -7,13 +7,76 @@ import random
 import math
 
 
+# 비트보드 정수(열마다 7비트, 아래부터 6비트가 칸이고 1비트는 보초)
+BOTTOM_MASK = sum(1 << (x * 7) for x in range(7))  # 각 열의 가장 아래 칸
+TOP_MASK = BOTTOM_MASK << 5  # 각 열의 가장 위 칸
+
+# 조브리스트 해시용 난수(고정 시드)
+zobrist_random = random.Random(0)
+ZOBRIST_PIECES = [[zobrist_random.getrandbits(64) for _ in range(49)] for _ in range(2)]  # [선 수/후 수][비트]
+ZOBRIST_SIDE = zobrist_random.getrandbits(64)  # 후 수 차례
+
+# 학습 데이터 증강용 대칭 변환(매스의 인덱스 리스트, 행동의 인덱스 리스트)
+SYMMETRIES = [
+    (list(range(42)), list(range(7))),  # 그대로
+    ([6 - i % 7 + i // 7 * 7 for i in range(42)], [6 - x for x in range(7)]),  # 좌우 반전
+]
+
+
+# 리스트 인덱스(x + y * 7, y=0이 가장 위)를 비트로 변환
+def index_to_bit(i):
+    return 1 << ((i % 7) * 7 + 5 - i // 7)
+
+
 # 게임 상태
 class State:
     # 초기화
     def __init__(self, pieces=None, enemy_pieces=None):
-        # 돌의 배치
-        self.pieces = pieces if pieces != None else [0] * 42
-        self.enemy_pieces = enemy_pieces if enemy_pieces != None else [0] * 42
+        # 돌의 배치(비트보드)
+        self.position = 0  # 자신의 돌
+        self.mask = 0  # 양쪽의 돌
+        self.moves = 0  # 둔 돌의 수
+        self.zobrist = 0  # 조브리스트 해시
+
+        # 리스트 형식의 돌의 배치는 필요할 때만 생성
+        self.pieces_list = None
+        self.enemy_pieces_list = None
+
+        # 리스트로 지정한 돌의 배치를 비트보드로 변환
+        if pieces != None and enemy_pieces != None:
+            for i in range(42):
+                if pieces[i] == 1:
+                    self.position |= index_to_bit(i)
+                if pieces[i] == 1 or enemy_pieces[i] == 1:
+                    self.mask |= index_to_bit(i)
+                    self.moves += 1
+            self.zobrist = self.compute_zobrist()
+
+    # 조브리스트 해시 계산
+    def compute_zobrist(self):
+        own = self.moves % 2
+        zobrist = 0 if own == 0 else ZOBRIST_SIDE
+        for bit in range(49):
+            if self.position & (1 << bit):
+                zobrist ^= ZOBRIST_PIECES[own][bit]
+            elif self.mask & (1 << bit):
+                zobrist ^= ZOBRIST_PIECES[1 - own][bit]
+        return zobrist
+
+    # 자신의 돌의 배치(리스트)
+    @property
+    def pieces(self):
+        if self.pieces_list is None:
+            self.pieces_list = [1 if self.position & index_to_bit(i) else 0 for i in range(42)]
+        return self.pieces_list
+
+    # 상대의 돌의 배치(리스트)
+    @property
+    def enemy_pieces(self):
+        if self.enemy_pieces_list is None:
+            enemy = self.position ^ self.mask
+            self.enemy_pieces_list = [1 if enemy & index_to_bit(i) else 0 for i in range(42)]
+        return self.enemy_pieces_list
 
     # 돌의 수 얻기
     def piece_count(self, pieces):
@@ -25,26 +88,17 @@ class State:
 
     # 패배 여부 판정
     def is_lose(self):
-        # 돌 4개 연결 여부 판정
-        def is_comp(x, y, dx, dy):
-            for k in range(4):
-                if y < 0 or 5 < y or x < 0 or 6 < x or \
-                        self.enemy_pieces[x + y * 7] == 0:
-                    return False
-                x, y = x + dx, y + dy
-            return True
-
-        # 패배 여부 판정
-        for j in range(6):
-            for i in range(7):
-                if is_comp(i, j, 1, 0) or is_comp(i, j, 0, 1) or \
-                        is_comp(i, j, 1, -1) or is_comp(i, j, 1, 1):
-                    return True
+        # 직전에 둔 상대의 돌이 4개 연결되었는지 시프트와 AND로 판정
+        enemy = self.position ^ self.mask
+        for d in (1, 7, 6, 8):  # 세로, 가로, 대각선 2방향
+            m = enemy & (enemy >> d)
+            if m & (m >> (2 * d)):
+                return True
         return False
 
     # 무승부 여부 판정
     def is_draw(self):
-        return self.piece_count(self.pieces) + self.piece_count(self.enemy_pieces) == 42
+        return self.moves == 42
 
     # 게임 종료 여부 판정
     def is_done(self):
@@ -52,24 +106,29 @@ class State:
 
     # 다음 상태 얻기
     def next(self, action):
-        pieces = self.pieces.copy()
-        for j in range(5, -1, -1):
-            if self.pieces[action + j * 7] == 0 and self.enemy_pieces[action + j * 7] == 0:
-                pieces[action + j * 7] = 1
-                break
-        return State(self.enemy_pieces, pieces)
+        action = int(action)  # 넘파이 정수로 비트보드가 바뀌지 않도록 변환
+        state = State()
+        state.position = self.position ^ self.mask  # 자신과 상대 교대
+        state.mask = self.mask | (self.mask + (1 << (action * 7)))  # 열의 가장 아래 빈칸에 돌 추가
+        state.moves = self.moves + 1
+
+        # 추가한 돌의 비트로 조브리스트 해시 갱신
+        bit = (state.mask ^ self.mask).bit_length() - 1
+        state.zobrist = self.zobrist ^ ZOBRIST_PIECES[self.moves % 2][bit] ^ ZOBRIST_SIDE
+        return state
 
     # 합법적인 수 리스트 얻기
     def legal_actions(self):
+        free = TOP_MASK & ~self.mask  # 가장 위 칸이 비어있는 열
         actions = []
         for i in range(7):
-            if self.pieces[i] == 0 and self.enemy_pieces[i] == 0:
+            if free & (1 << (i * 7 + 5)):
                 actions.append(i)
         return actions
 
     # 선 수 여부 확인
     def is_first_player(self):
-        return self.piece_count(self.pieces) == self.piece_count(self.enemy_pieces)
+        return self.moves % 2 == 0
 
     # 문자열 표시
     def __str__(self):
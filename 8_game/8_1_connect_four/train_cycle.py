@@ -8,16 +8,18 @@ from self_play import self_play
 from train_network import train_network
 from evaluate_network import evaluate_network
 
-# 듀얼 네트워크 생성
-dual_network()
+# 동작 확인(셀프 플레이 워커 프로세스가 다시 실행하지 않도록 보호)
+if __name__ == '__main__':
+    # 듀얼 네트워크 생성
+    dual_network()
 
-for i in range(10):
-    print('Train', i, '====================')
-    # 셀프 플레이 파트
-    self_play()
+    for i in range(10):
+        print('Train', i, '====================')
+        # 셀프 플레이 파트
+        self_play()
 
-    # 파라미터 변경 파트
-    train_network()
+        # 파라미터 변경 파트
+        train_network()
 
-    # 신규 파라미터 평가 파트
-    evaluate_network()
+        # 신규 파라미터 평가 파트
+        evaluate_network()
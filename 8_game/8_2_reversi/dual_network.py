@@ -2,11 +2,7 @@
 # 듀얼 네트워크 생성
 # ====================
 
-# 패키지 임포트
-from tensorflow.keras.layers import Activation, Add, BatchNormalization, Conv2D, Dense, GlobalAveragePooling2D, Input
-from tensorflow.keras.models import Model
-from tensorflow.keras.regularizers import l2
-from tensorflow.keras import backend as K
+# 패키지 임포트(TensorFlow는 네트워크 생성 시에만 임포트해 입력 셰이프 등의 파라미터는 TensorFlow 없이 참조 가능)
 import os
 
 # 파라미터 준비
@@ -18,12 +14,16 @@ DN_OUTPUT_SIZE = 37  # 행동 수(배치 위치(6*6) + 패스(1))
 
 # 컨볼루션 레이어 생성
 def conv(filters):
+    from tensorflow.keras.layers import Conv2D
+    from tensorflow.keras.regularizers import l2
     return Conv2D(filters, 3, padding='same', use_bias=False,
                   kernel_initializer='he_normal', kernel_regularizer=l2(0.0005))
 
 
 # 레지듀얼 블록 생성
 def residual_block():
+    from tensorflow.keras.layers import Activation, Add, BatchNormalization
+
     def f(x):
         sc = x
         x = conv(DN_FILTERS)(x)
@@ -44,6 +44,11 @@ def dual_network():
     if os.path.exists('./model/best.h5'):
         return
 
+    from tensorflow.keras.layers import Activation, BatchNormalization, Dense, GlobalAveragePooling2D, Input
+    from tensorflow.keras.models import Model
+    from tensorflow.keras.regularizers import l2
+    from tensorflow.keras import backend as K
+
     # 입력 레이어
     input = Input(shape=DN_INPUT_SHAPE)
 
@@ -7,27 +7,109 @@ import random
 import math
 
 
+# 비트보드 정수(비트 번호는 리스트 인덱스 x + y * 6과 동일)
+FULL_MASK = (1 << 36) - 1  # 모든 칸
+NOT_COL0 = FULL_MASK & ~sum(1 << (y * 6) for y in range(6))  # 가장 왼쪽 열 제외
+NOT_COL5 = FULL_MASK & ~sum(1 << (y * 6 + 5) for y in range(6))  # 가장 오른쪽 열 제외
+
+# 4방향의 (시프트 양, 왼쪽 시프트 마스크, 오른쪽 시프트 마스크)
+# 마스크는 보드 끝에서 반대쪽 끝으로 넘어간 비트를 제거
+DIRECTIONS = ((1, NOT_COL0, NOT_COL5), (7, NOT_COL0, NOT_COL5),
+              (6, FULL_MASK, FULL_MASK), (5, NOT_COL5, NOT_COL0))
+
+# 조브리스트 해시용 난수(고정 시드)
+zobrist_random = random.Random(0)
+ZOBRIST_PIECES = [[zobrist_random.getrandbits(64) for _ in range(36)] for _ in range(2)]  # [선 수/후 수][매스]
+ZOBRIST_FLIP = [ZOBRIST_PIECES[0][i] ^ ZOBRIST_PIECES[1][i] for i in range(36)]  # 돌 뒤집기
+ZOBRIST_SIDE = zobrist_random.getrandbits(64)  # 후 수 차례
+ZOBRIST_PASS_END = zobrist_random.getrandbits(64)  # 연속 패스에 따른 종료
+
+
+# 정사각형 보드의 대칭 변환 8종(변환 후 매스 → 변환 전 매스의 인덱스 리스트)
+def square_symmetries(size):
+    symmetries = []
+    for k in range(8):
+        perm = []
+        for i in range(size * size):
+            y, x = divmod(i, size)
+            if k & 1: x = size - 1 - x  # 좌우 반전
+            if k & 2: y = size - 1 - y  # 상하 반전
+            if k & 4: x, y = y, x  # 대각선 반전
+            perm.append(x + y * size)
+        symmetries.append(perm)
+    return symmetries
+
+
+# 학습 데이터 증강용 대칭 변환(매스의 인덱스 리스트, 행동의 인덱스 리스트, 패스는 고정)
+SYMMETRIES = [(perm, perm + [36]) for perm in square_symmetries(6)]
+
+
+# 비트 수 얻기
+def bit_count(b):
+    return bin(b).count('1')
+
+
 # 게임 상태
 class State:
     # 초기화
-    def __init__(self, pieces=None, enemy_pieces=None, depth=0):
-        # 방향 정수
-        self.dxy = ((1, 0), (1, 1), (0, 1), (-1, 1), (-1, 0), (-1, -1), (0, -1), (1, -1))
-
+    def __init__(self, pieces=None, enemy_pieces=None, depth=0, zobrist=None):
         # 연속 패스에 따른 종료
         self.pass_end = False
 
-        # 돌의 배치
-        self.pieces = pieces
-        self.enemy_pieces = enemy_pieces
+        # 돌의 배치(비트보드)
+        self.position = 0  # 자신의 돌
+        self.enemy = 0  # 상대의 돌
         self.depth = depth
 
+        # 합법적인 수의 비트보드(필요할 때 계산해 보관)
+        self.legal = None
+
+        # 리스트 형식의 돌의 배치는 필요할 때만 생성
+        self.pieces_list = None
+        self.enemy_pieces_list = None
+
         # 돌의 초기 배치
         if pieces == None or enemy_pieces == None:
-            self.pieces = [0] * 36
-            self.pieces[14] = self.pieces[21] = 1
-            self.enemy_pieces = [0] * 36
-            self.enemy_pieces[15] = self.enemy_pieces[20] = 1
+            self.position = (1 << 14) | (1 << 21)
+            self.enemy = (1 << 15) | (1 << 20)
+
+        # 리스트로 지정한 돌의 배치를 비트보드로 변환
+        else:
+            for i in range(36):
+                if pieces[i] == 1:
+                    self.position |= 1 << i
+                if enemy_pieces[i] == 1:
+                    self.enemy |= 1 << i
+
+        # 조브리스트 해시(다음 상태는 차분으로 갱신)
+        self.zobrist = zobrist if zobrist != None else self.compute_zobrist()
+
+    # 조브리스트 해시 계산
+    def compute_zobrist(self):
+        own = self.depth % 2
+        zobrist = 0 if own == 0 else ZOBRIST_SIDE
+        for i in range(36):
+            if (self.position >> i) & 1:
+                zobrist ^= ZOBRIST_PIECES[own][i]
+            if (self.enemy >> i) & 1:
+                zobrist ^= ZOBRIST_PIECES[1 - own][i]
+        if self.pass_end:
+            zobrist ^= ZOBRIST_PASS_END
+        return zobrist
+
+    # 자신의 돌의 배치(리스트)
+    @property
+    def pieces(self):
+        if self.pieces_list is None:
+            self.pieces_list = [(self.position >> i) & 1 for i in range(36)]
+        return self.pieces_list
+
+    # 상대의 돌의 배치(리스트)
+    @property
+    def enemy_pieces(self):
+        if self.enemy_pieces_list is None:
+            self.enemy_pieces_list = [(self.enemy >> i) & 1 for i in range(36)]
+        return self.enemy_pieces_list
 
     # 돌의 수 얻기
     def piece_count(self, pieces):
@@ -39,87 +121,114 @@ class State:
 
     # 패배 여부 판정
     def is_lose(self):
-        return self.is_done() and self.piece_count(self.pieces) < self.piece_count(self.enemy_pieces)
+        return self.is_done() and bit_count(self.position) < bit_count(self.enemy)
 
     # 무승부 여부 판정
     def is_draw(self):
-        return self.is_done() and self.piece_count(self.pieces) == self.piece_count(self.enemy_pieces)
+        return self.is_done() and bit_count(self.position) == bit_count(self.enemy)
 
     # 게임 종료 여부 판정
     def is_done(self):
-        return self.piece_count(self.pieces) + self.piece_count(self.enemy_pieces) == 36 or self.pass_end
+        return (self.position | self.enemy) == FULL_MASK or self.pass_end
 
     # 다음 상태 얻기
     def next(self, action):
-        state = State(self.pieces.copy(), self.enemy_pieces.copy(), self.depth + 1)
+        action = int(action)  # 넘파이 정수로 비트보드가 바뀌지 않도록 변환
+        position, enemy = self.position, self.enemy
+        zobrist = self.zobrist ^ ZOBRIST_SIDE
         if action != 36:
-            state.is_legal_action_xy(action % 6, int(action / 6), True)
-        w = state.pieces
-        state.pieces = state.enemy_pieces
-        state.enemy_pieces = w
+            move = 1 << action
+            flips = self.flips(move)
+            position |= move | flips
+            enemy ^= flips
+
+            # 둔 돌과 뒤집은 돌로 조브리스트 해시 갱신
+            zobrist ^= ZOBRIST_PIECES[self.depth % 2][action]
+            while flips:
+                bit = flips & -flips
+                zobrist ^= ZOBRIST_FLIP[bit.bit_length() - 1]
+                flips ^= bit
+
+        # 다음 상태 생성
+        state = State(depth=self.depth + 1, zobrist=zobrist)
+
+        # 자신과 상대 교대
+        state.position = enemy
+        state.enemy = position
 
         # 2회 연속 패스 판정
-        if action == 36 and state.legal_actions() == [36]:
+        if action == 36 and state.legal_mask() == 0:
             state.pass_end = True
+            state.zobrist ^= ZOBRIST_PASS_END
         return state
 
+    # 합법적인 수의 비트보드 얻기
+    def legal_mask(self):
+        if self.legal is None:
+            empty = FULL_MASK & ~(self.position | self.enemy)
+            p = self.position
+            legal = 0
+            for d, left_mask, right_mask in DIRECTIONS:
+                # 자신의 돌에서 이어지는 상대의 돌(최대 4개)
+                o = self.enemy & left_mask
+                t = (p << d) & o
+                t |= (t << d) & o
+                t |= (t << d) & o
+                t |= (t << d) & o
+
+                # 그 다음 빈칸이 합법적인 수
+                legal |= (t << d) & left_mask & empty
+
+                # 반대 방향도 같은 방법으로 판정
+                o = self.enemy & right_mask
+                t = (p >> d) & o
+                t |= (t >> d) & o
+                t |= (t >> d) & o
+                t |= (t >> d) & o
+                legal |= (t >> d) & right_mask & empty
+            self.legal = legal
+        return self.legal
+
+    # 돌을 둘 때 뒤집히는 돌의 비트보드 얻기
+    def flips(self, move):
+        flips = 0
+        for d, left_mask, right_mask in DIRECTIONS:
+            # 상대의 돌이 이어지는 동안 진행
+            f = 0
+            x = (move << d) & left_mask
+            while x & self.enemy:
+                f |= x
+                x = (x << d) & left_mask
+
+            # 자신의 돌로 끝나는 경우에만 뒤집음
+            if x & self.position:
+                flips |= f
+
+            # 반대 방향도 같은 방법으로 뒤집음
+            f = 0
+            x = (move >> d) & right_mask
+            while x & self.enemy:
+                f |= x
+                x = (x >> d) & right_mask
+            if x & self.position:
+                flips |= f
+        return flips
+
     # 합법적인 수 리스트 얻기
     def legal_actions(self):
+        legal = self.legal_mask()
         actions = []
-        for j in range(0, 6):
-            for i in range(0, 6):
-                if self.is_legal_action_xy(i, j):
-                    actions.append(i + j * 6)
+        while legal:
+            bit = legal & -legal  # 가장 아래 비트
+            actions.append(bit.bit_length() - 1)
+            legal ^= bit
         if len(actions) == 0:
             actions.append(36)  # 패스
         return actions
 
     # 임의의 매스가 합법적인 수인지 판정
-    def is_legal_action_xy(self, x, y, flip=False):
-        # 임의의 매스에서 임의의 방향이 합법적인 수인지 판정
-        def is_legal_action_xy_dxy(x, y, dx, dy):
-            # １번째 상대의 돌
-            x, y = x + dx, y + dy
-            if y < 0 or 5 < y or x < 0 or 5 < x or \
-                    self.enemy_pieces[x + y * 6] != 1:
-                return False
-
-            # 2번째 이후
-            for j in range(6):
-                # 빈 칸
-                if y < 0 or 5 < y or x < 0 or 5 < x or \
-                        (self.enemy_pieces[x + y * 6] == 0 and self.pieces[x + y * 6] == 0):
-                    return False
-
-                # 자신의 돌
-                if self.pieces[x + y * 6] == 1:
-                    # 반전
-                    if flip:
-                        for i in range(6):
-                            x, y = x - dx, y - dy
-                            if self.pieces[x + y * 6] == 1:
-                                return True
-                            self.pieces[x + y * 6] = 1
-                            self.enemy_pieces[x + y * 6] = 0
-                    return True
-                # 상대의 돌
-                x, y = x + dx, y + dy
-            return False
-
-        # 빈칸 없음
-        if self.enemy_pieces[x + y * 6] == 1 or self.pieces[x + y * 6] == 1:
-            return False
-
-        # 돌을 놓음
-        if flip:
-            self.pieces[x + y * 6] = 1
-
-        # 임의의 위치의 합법적인 수 여부 확인
-        flag = False
-        for dx, dy in self.dxy:
-            if is_legal_action_xy_dxy(x, y, dx, dy):
-                flag = True
-        return flag
+    def is_legal_action_xy(self, x, y):
+        return (self.legal_mask() >> (x + y * 6)) & 1 == 1
 
     # 선 수 여부 확인
     def is_first_player(self):
@@ -0,0 +1,121 @@
+# ====================
+# 넘파이만 사용하는 듀얼 네트워크 추론
+# ====================
+
+# 패키지 임포트
+from numpy.lib.stride_tricks import sliding_window_view
+import numpy as np
+import os
+
+
+# 모델의 가중치를 배치 정규화를 컨볼루션에 합친 배열로 변환
+def fold_weights(model):
+    layers = {}
+    for layer in model.layers:
+        layers.setdefault(type(layer).__name__, []).append(layer)
+
+    # 컨볼루션 레이어와 바로 뒤의 배치 정규화를 합쳐 커널과 바이어스 계산
+    weights = {}
+    for i, (conv, bn) in enumerate(zip(layers['Conv2D'], layers['BatchNormalization'])):
+        gamma, beta, mean, variance = bn.get_weights()
+        scale = gamma / np.sqrt(variance + bn.epsilon)
+        weights['conv{}_w'.format(i)] = conv.get_weights()[0] * scale
+        weights['conv{}_b'.format(i)] = beta - mean * scale
+
+    # policy 출력과 value 출력의 전결합 레이어
+    for dense in layers['Dense']:
+        name = 'policy' if dense.name == 'pi' else 'value'
+        weights[name + '_w'], weights[name + '_b'] = dense.get_weights()
+    return {k: v.astype(np.float32) for k, v in weights.items()}
+
+
+# 모델 파일을 넘파이 가중치 파일로 변환(변환에만 TensorFlow 필요)
+def export_numpy(model_path='./model/best.h5', path='./model/best.npz'):
+    from tensorflow.keras.models import load_model
+
+    # 임시 파일에 저장한 후 교체(여러 프로세스가 동시에 변환해도 완성된 파일만 보이도록)
+    temp_path = path.replace('.npz', '.{}.tmp.npz'.format(os.getpid()))
+    np.savez(temp_path, **fold_weights(load_model(model_path)))
+    os.replace(temp_path, path)
+
+
+# 넘파이 가중치 파일 로드(모델 파일보다 오래된 경우 다시 변환)
+def load_numpy_network(model_path='./model/best.h5', path='./model/best.npz'):
+    if not os.path.exists(path) or os.path.getmtime(path) < os.path.getmtime(model_path):
+        export_numpy(model_path, path)
+    with np.load(path) as f:
+        return NumpyNetwork(dict(f))
+
+
+# 넘파이로 순전파를 수행하는 듀얼 네트워크
+class NumpyNetwork:
+    # 초기화
+    def __init__(self, weights):
+        self.weights = weights
+        self.conv_count = sum(1 for k in weights if k.startswith('conv') and k.endswith('_w'))
+
+        # 커널을 (3*3*입력 채널, 출력 채널)의 행렬로 변환
+        self.kernels = []
+        for i in range(self.conv_count):
+            w = weights['conv{}_w'.format(i)]
+            self.kernels.append(w.reshape(-1, w.shape[3]))
+
+    # 3x3 컨볼루션(same 패딩, 주변 매스를 펼친 행렬과 커널의 행렬곱 1회)
+    def conv(self, x, i):
+        n, a, b, c = x.shape
+        xp = np.pad(x, ((0, 0), (1, 1), (1, 1), (0, 0)))
+        patches = sliding_window_view(xp, (3, 3), axis=(1, 2)).transpose(0, 1, 2, 4, 5, 3)
+        y = patches.reshape(n * a * b, 9 * c) @ self.kernels[i] + self.weights['conv{}_b'.format(i)]
+        return y.reshape(n, a, b, -1)
+
+    # 추론(inference_function()으로 생성한 함수와 같은 형식)
+    def __call__(self, x):
+        x = np.asarray(x, dtype=np.float32)
+
+        # 컨볼루션 레이어
+        x = np.maximum(self.conv(x, 0), 0)
+
+        # 레지듀얼 블록
+        for i in range(1, self.conv_count, 2):
+            sc = x
+            x = np.maximum(self.conv(x, i), 0)
+            x = self.conv(x, i + 1)
+            x = np.maximum(x + sc, 0)
+
+        # 풀링 레이어
+        x = x.mean(axis=(1, 2))
+
+        # policy 출력(소프트맥스)
+        p = x @ self.weights['policy_w'] + self.weights['policy_b']
+        p = np.exp(p - p.max(axis=1, keepdims=True))
+        p /= p.sum(axis=1, keepdims=True)
+
+        # value 출력
+        v = np.tanh(x @ self.weights['value_w'] + self.weights['value_b'])
+        return [p, v]
+
+
+# 동작 확인
+if __name__ == '__main__':
+    # 베스트 플레이어 모델을 변환하고 차이 확인
+    from tensorflow.keras.models import load_model
+    from dual_network import DN_INPUT_SHAPE
+    import time
+
+    export_numpy()
+    network = load_numpy_network()
+    model = load_model('./model/best.h5')
+
+    # 무작위 입력으로 출력 비교
+    a, b, c = DN_INPUT_SHAPE
+    x = np.random.randint(0, 2, (64, a, b, c)).astype(np.float32)
+    y0 = model(x, training=False)
+    y1 = network(x)
+    print('policy max diff', np.abs(np.asarray(y0[0]) - y1[0]).max())
+    print('value max diff', np.abs(np.asarray(y0[1]) - y1[1]).max())
+
+    # 1국면 추론 시간 측정
+    start = time.perf_counter()
+    for _ in range(100):
+        network(x[:1])
+    print('numpy {:.3f} ms/call'.format((time.perf_counter() - start) * 10))
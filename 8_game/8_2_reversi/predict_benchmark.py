@@ -0,0 +1,52 @@
+# ====================
+# 추론 지연 시간 측정
+# ====================
+
+# 패키지 임포트
+from dual_network import DN_INPUT_SHAPE
+from pv_mcts import inference_function
+from tensorflow.keras.models import load_model
+import numpy as np
+import time
+
+# 파라미터 준비
+PB_CALL_COUNT = 200  # 측정할 추론 횟수
+PB_WARMUP_COUNT = 10  # 측정 전 준비 추론 횟수(트레이스 등)
+
+
+# 추론 1회당 평균 시간(밀리초) 측정
+def measure(f, x):
+    # 준비 실행
+    for _ in range(PB_WARMUP_COUNT):
+        f(x)
+
+    # 측정
+    start = time.perf_counter()
+    for _ in range(PB_CALL_COUNT):
+        f(x)
+    return (time.perf_counter() - start) / PB_CALL_COUNT * 1000
+
+
+# 추론 지연 시간 비교
+def predict_benchmark():
+    # 베스트 플레이어 모델 로드
+    model = load_model('./model/best.h5')
+
+    # 추론 1회분의 입력 데이터
+    a, b, c = DN_INPUT_SHAPE
+    x = np.zeros((1, a, b, c), dtype=np.float32)
+
+    # 기존 방식(model.predict)
+    before = measure(lambda x: model.predict(x, batch_size=1, verbose=0), x)
+    print('model.predict       {:.3f} ms/call'.format(before))
+
+    # 트레이스한 그래프 함수 직접 호출
+    infer = inference_function(model)
+    after = measure(infer, x)
+    print('inference_function  {:.3f} ms/call'.format(after))
+    print('Speedup {:.1f}x'.format(before / after))
+
+
+# 동작 확인
+if __name__ == '__main__':
+    predict_benchmark()
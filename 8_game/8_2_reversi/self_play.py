@@ -4,19 +4,35 @@
 
 # 패키지 임포트
 from game import State
-from pv_mcts import pv_mcts_scores
+from pv_mcts import SearchTree, inference_function, PV_BATCH_SIZE
 from dual_network import DN_OUTPUT_SIZE
+from inference_server import InferenceServer
+from evaluation_cache import EvaluationCache
+from training_data import history_to_arrays, write_arrays, read_arrays, TD_SUFFIX
+from numpy_network import NumpyNetwork, fold_weights, export_numpy, load_numpy_network
 from datetime import datetime
-from tensorflow.keras.models import load_model
-from tensorflow.keras import backend as K
 from pathlib import Path
+from multiprocessing import get_context
+from concurrent.futures import ThreadPoolExecutor
 import numpy as np
-import pickle
+import subprocess
+import sys
 import os
 
 # 파라미터 준비
 SP_GAME_COUNT = 500  # 셀프 플레이를 수행할 게임 수(오리지널: 25,000)
 SP_TEMPERATURE = 1.0  # 볼츠만 분포의 온도 파라미터
+SP_PROCESS_COUNT = 1  # 셀프 플레이 워커 프로세스 수(1: 메인 프로세스에서 실행)
+SP_THREAD_COUNT = 1  # 추론 서버를 공유하며 동시에 진행할 게임 수(1: 1게임씩 실행)
+SP_NUMPY = False  # TensorFlow 대신 넘파이로 추론(1게임씩 실행하거나 여러 프로세스로 실행하는 경우)
+
+# 워커 프로세스별 상태
+worker_infer = None  # 추론 함수
+worker_counter = None  # 프로세스 간 공유 게임 카운터
+worker_error = None  # 초기화 중 발생한 예외(셀프 플레이에서 다시 발생시킴)
+
+# 베스트 플레이어의 평가 캐시(best.h5가 바뀔 때까지 사이클 간 유지)
+evaluation_cache = EvaluationCache()
 
 
 # 선 수 플레이어 가치
@@ -27,31 +43,38 @@ def first_player_value(ended_state):
     return 0
 
 
-# 학습 데이터 저장
-def write_data(history):
+# 학습 데이터 파일 경로
+# tag: 같은 시각에 저장하는 워커끼리 파일명이 겹치지 않도록 붙이는 문자열
+def data_path(tag=''):
     now = datetime.now()
     os.makedirs('./data/', exist_ok=True)  # 폴더가 없는 경우에는 생성
-    path = './data/{:04}{:02}{:02}{:02}{:02}{:02}.history'.format(
-        now.year, now.month, now.day, now.hour, now.minute, now.second)
-    with open(path, mode='wb') as f:
-        pickle.dump(history, f)
+    return './data/{:04}{:02}{:02}{:02}{:02}{:02}{}{}'.format(
+        now.year, now.month, now.day, now.hour, now.minute, now.second, tag, TD_SUFFIX)
+
+
+# 학습 데이터 저장(입력 데이터, 정책, 가치의 배열)
+def write_data(history, tag=''):
+    write_arrays(data_path(tag), history_to_arrays(history))
 
 
 # 1 게임 실행
-def play(model):
+def play(infer):
     # 학습 데이터
     history = []
 
     # 상태 생성
     state = State()
 
+    # 이전 수의 탐색 결과를 재사용하는 탐색 트리
+    tree = SearchTree(infer, PV_BATCH_SIZE)
+
     while True:
         # 게임 종료 시
         if state.is_done():
             break
 
         # 합법적인 수의 확률 분포 얻기
-        scores = pv_mcts_scores(model, state, SP_TEMPERATURE)
+        scores = tree.scores(state, SP_TEMPERATURE)
 
         # 학습 데이터에 상태와 정책 추가
         policies = [0] * DN_OUTPUT_SIZE
@@ -73,30 +96,206 @@ def play(model):
     return history
 
 
-# 셀프 플레이
-def self_play():
+# 워커 프로세스 초기화
+def init_worker(counter):
+    global worker_infer, worker_counter, worker_error
+    worker_counter = counter
+
+    # TensorFlow는 필요할 때만 임포트(self_play_worker.py가 이 모듈을 TensorFlow 없이 임포트하도록)
+    from folded_network import load_inference_model
+    import tensorflow as tf
+
+    # 코어를 프로세스끼리 나눠 쓰도록 프로세스당 스레드 1개로 제한
+    tf.config.threading.set_intra_op_parallelism_threads(1)
+    tf.config.threading.set_inter_op_parallelism_threads(1)
+
+    # 베스트 플레이어 모델은 워커당 1회만 로드
+    # (초기화 중 워커가 종료되면 Pool이 워커를 계속 다시 생성해 멈추므로 예외는 보관해 두고 셀프 플레이에서 발생시킴)
+    try:
+        infer = inference_function(load_inference_model('./model/best.h5'))
+    except Exception as e:
+        worker_error = e
+        return
+    worker_infer = evaluation_cache.wrap(infer)
+
+
+# 워커 프로세스의 셀프 플레이
+def play_worker(_):
+    if worker_error is not None:
+        raise worker_error
+
     # 학습 데이터
     history = []
 
-    # 베스트 플레이어 모델 로드
-    model = load_model('./model/best.h5')
+    # 이번 셀프 플레이의 캐시 적중 수를 세기 위한 시작값
+    hits, misses = evaluation_cache.hits, evaluation_cache.misses
 
-    # 여러 차례 게임 실행
-    for i in range(SP_GAME_COUNT):
-        # 1ゲームの実行
-        h = play(model)
-        history.extend(h)
+    # 공유 게임 카운터가 SP_GAME_COUNT에 도달할 때까지 게임 실행
+    while True:
+        with worker_counter.get_lock():
+            if worker_counter.value >= SP_GAME_COUNT:
+                break
+            worker_counter.value += 1
+            i = worker_counter.value
+
+        # 게임 1회 실행
+        history.extend(play(worker_infer))
 
         # 출력
-        print('\rSelfPlay {}/{}'.format(i + 1, SP_GAME_COUNT), end='')
+        print('\rSelfPlay {}/{}'.format(i, SP_GAME_COUNT), end='')
+    return history, evaluation_cache.hits - hits, evaluation_cache.misses - misses
+
+
+# 여러 프로세스를 활용한 셀프 플레이
+def self_play_parallel(process_count):
+    # TensorFlow를 로드한 프로세스는 fork할 수 없으므로 spawn으로 워커 생성
+    context = get_context('spawn')
+    counter = context.Value('i', 0)
+
+    # 워커별 학습 데이터와 캐시 적중 수 얻기
+    with context.Pool(process_count, initializer=init_worker, initargs=(counter,)) as pool:
+        results = pool.map(play_worker, range(process_count))
     print('')
 
+    # 학습 데이터를 하나로 합쳐 저장
+    history = []
+    for h, _, _ in results:
+        history.extend(h)
+    write_data(history)
+
+    # 캐시 적중 수 출력
+    hits = sum(r[1] for r in results)
+    misses = sum(r[2] for r in results)
+    print('EvaluationCache hits {} misses {}'.format(hits, misses))
+
+
+# 넘파이 추론 워커 프로세스를 활용한 셀프 플레이
+# 워커는 TensorFlow를 임포트하지 않는 별도 스크립트(self_play_worker.py)로 실행
+# (spawn으로 생성한 워커는 메인 모듈을 다시 임포트하므로 TensorFlow도 함께 로드됨)
+def self_play_numpy_parallel(process_count):
+    # 넘파이 가중치 파일은 워커마다 변환하지 않도록 미리 변환
+    export_numpy()
+
+    # 게임을 워커별로 나눠 실행(학습 데이터는 워커별 임시 파일에 저장)
+    script = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'self_play_worker.py')
+    os.makedirs('./data/', exist_ok=True)
+    workers = []
+    for i in range(process_count):
+        count = SP_GAME_COUNT // process_count + (1 if i < SP_GAME_COUNT % process_count else 0)
+        if count > 0:
+            path = './data/worker{}.tmp'.format(i)
+            process = subprocess.Popen([sys.executable, script, str(i), str(count), path],
+                                       stdout=subprocess.PIPE, text=True)
+            workers.append((path, process))
+
+    # 워커별 학습 데이터와 캐시 적중 수 얻기
+    arrays, hits, misses = [], 0, 0
+    for path, process in workers:
+        out, _ = process.communicate()
+        if process.returncode != 0:
+            raise RuntimeError('self_play_worker.py exited with {}'.format(process.returncode))
+        h, m = out.split()[-2:]
+        hits, misses = hits + int(h), misses + int(m)
+        arrays.append([np.array(a) for a in read_arrays(path)])
+        os.remove(path)
+    print('')
+
+    # 학습 데이터를 하나로 합쳐 저장
+    write_arrays(data_path(), [np.concatenate(a) for a in zip(*arrays)])
+
+    # 캐시 적중 수 출력
+    print('EvaluationCache hits {} misses {}'.format(hits, misses))
+
+
+# 여러 게임을 동시에 진행하는 셀프 플레이
+def play_concurrent(model, thread_count, generation=None):
+    # 모델을 보유하고 여러 게임의 추론을 일괄 처리하는 추론 서버
+    server = InferenceServer(model)
+
+    # 캐시에 없는 국면만 추론 서버에 요청
+    infer = evaluation_cache.wrap(server, generation)
+
+    # 게임별 스레드가 추론 서버에 리프 노드의 국면을 요청
+    history = []
+    with ThreadPoolExecutor(thread_count) as executor:
+        for i, h in enumerate(executor.map(lambda _: play(infer), range(SP_GAME_COUNT))):
+            history.extend(h)
+
+            # 출력
+            print('\rSelfPlay {}/{}'.format(i + 1, SP_GAME_COUNT), end='')
+    print('')
+
+    # 추론 서버 종료
+    server.close()
+    return history
+
+
+# 셀프 플레이(model: 상주시킨 베스트 플레이어 모델 또는 그 추론 함수, generation: 그 세대)
+def self_play(model=None, generation=None):
+    # 여러 프로세스로 실행
+    if SP_PROCESS_COUNT > 1:
+        if SP_NUMPY:
+            self_play_numpy_parallel(SP_PROCESS_COUNT)
+        else:
+            self_play_parallel(SP_PROCESS_COUNT)
+        return
+
+    # TensorFlow는 필요할 때만 임포트
+    from folded_network import load_inference_model, FN_QUANTIZED
+    from tensorflow.keras import backend as K
+
+    # 학습 데이터
+    history = []
+
+    # 넘파이 추론은 best.h5에서 직접 변환하므로 양자화 모델 설정은 무시
+    numpy_only = SP_NUMPY and SP_THREAD_COUNT == 1
+    if numpy_only and FN_QUANTIZED:
+        print('SP_NUMPY: FN_QUANTIZED is ignored')
+
+    # 베스트 플레이어 모델 로드(상주 모델이 주어진 경우 그대로 사용, 넘파이 추론만 하는 경우 로드하지 않음)
+    resident = model is not None
+    if not resident and not numpy_only:
+        model = load_inference_model('./model/best.h5')
+
+    # 여러 게임을 동시에 실행
+    if SP_THREAD_COUNT > 1:
+        history = play_concurrent(model, SP_THREAD_COUNT, generation)
+
+    # 1게임씩 실행
+    else:
+        # 평가 캐시를 적용한 추론 함수 생성
+        if SP_NUMPY:
+            # 상주 모델(배치 정규화 포함)은 그대로 변환, 그 외에는 best.h5에서 변환한 가중치 파일 로드
+            if not resident:
+                infer = load_numpy_network()
+            elif isinstance(model, NumpyNetwork):
+                infer = model
+            else:
+                infer = NumpyNetwork(fold_weights(model))
+        else:
+            infer = inference_function(model)
+        infer = evaluation_cache.wrap(infer, generation)
+
+        # 여러 차례 게임 실행
+        for i in range(SP_GAME_COUNT):
+            # 1ゲームの実行
+            h = play(infer)
+            history.extend(h)
+
+            # 출력
+            print('\rSelfPlay {}/{}'.format(i + 1, SP_GAME_COUNT), end='')
+        print('')
+
     # 학습 데이터 저장
     write_data(history)
 
-    # 모델 파기
-    K.clear_session()
-    del model
+    # 캐시 적중 수 출력(같은 베스트 플레이어 세대의 누계)
+    print('EvaluationCache', evaluation_cache)
+
+    # 모델 파기(상주 모델은 유지)
+    if not resident:
+        K.clear_session()
+        del model
 
 
 # 동작 확인
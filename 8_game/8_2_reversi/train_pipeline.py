@@ -0,0 +1,108 @@
+# ====================
+# 모델을 상주시킨 학습 사이클 실행
+# ====================
+
+# 패키지 임포트
+from dual_network import dual_network
+from self_play import self_play, SP_PROCESS_COUNT, SP_NUMPY
+from train_network import train_network
+from evaluate_network import evaluate_network, EN_PROCESS_COUNT
+from folded_network import resident_inference
+from numpy_network import NumpyNetwork, fold_weights
+from tensorflow.keras.models import load_model, clone_model
+from concurrent.futures import ThreadPoolExecutor
+import os
+
+# 파라미터 준비
+TP_CYCLE_COUNT = 10  # 학습 사이클 수
+
+
+# 모델 파일을 백그라운드에서 저장
+class Checkpointer:
+    # 초기화
+    def __init__(self, model):
+        self.model = clone_model(model)  # 저장 전용 모델
+        self.executor = ThreadPoolExecutor(1)  # 요청 순서대로 저장
+        self.futures = []  # 완료를 확인하지 않은 저장 요청
+
+    # 저장 요청(가중치는 요청 시점의 값을 복사해 전달)
+    def save(self, model, path):
+        self.futures.append(self.executor.submit(self.write, model.get_weights(), path))
+
+    # 임시 파일에 저장한 후 교체(저장 중인 파일을 다른 프로세스가 읽지 않도록)
+    def write(self, weights, path):
+        self.model.set_weights(weights)
+        temp_path = path.replace('.h5', '.tmp.h5')
+        self.model.save(temp_path)
+        os.replace(temp_path, path)
+
+    # 요청한 저장 완료 대기(앞선 저장에서 발생한 예외도 빠뜨리지 않고 발생시킴)
+    def wait(self):
+        futures, self.futures = self.futures, []
+        for future in futures:
+            future.result()
+
+    # 종료
+    def close(self):
+        try:
+            self.wait()
+        finally:
+            self.executor.shutdown()
+
+
+# 상주 모델의 셀프 플레이용 추론 함수(SP_NUMPY 설정 시 넘파이 네트워크, 그 외에는 infer 그대로)
+def self_play_inference(model, infer):
+    if SP_NUMPY:
+        return NumpyNetwork(fold_weights(model))
+    return infer
+
+
+# 학습 사이클 실행
+def train_pipeline():
+    # 듀얼 네트워크 생성
+    dual_network()
+
+    # 베스트 플레이어와 최신 플레이어 모델은 1회만 로드
+    best_model = load_model('./model/best.h5')
+    latest_model = load_model('./model/best.h5')
+    checkpointer = Checkpointer(best_model)
+    generation = 0  # 베스트 플레이어 세대(평가 캐시 무효화에 사용)
+
+    # 추론 함수는 MCTS 플레이어와 같은 추론 전용 모델로 가중치 교체 시에만 생성해 재사용
+    best_infer = resident_inference(best_model)
+    self_play_infer = self_play_inference(best_model, best_infer)
+
+    for i in range(TP_CYCLE_COUNT):
+        print('Train', i, '====================')
+        # 셀프 플레이 파트(워커 프로세스는 파일에서 로드하므로 저장 완료 대기)
+        if SP_PROCESS_COUNT > 1:
+            checkpointer.wait()
+        self_play(self_play_infer, generation)
+
+        # 파라미터 갱신 파트(베스트 플레이어의 가중치부터 학습)
+        latest_model.set_weights(best_model.get_weights())
+        train_network(latest_model)
+        checkpointer.save(latest_model, './model/latest.h5')
+        latest_infer = resident_inference(latest_model)
+
+        # 신규 파라미터 평가 파트(워커 프로세스는 파일에서 로드하므로 저장 완료 대기)
+        if EN_PROCESS_COUNT > 1:
+            checkpointer.wait()
+        update_best_player = evaluate_network(latest_infer, best_infer)
+
+        # 베스트 플레이어 교대(파일을 다시 읽지 않고 가중치와 최신 플레이어의 추론 함수만 교체)
+        if update_best_player:
+            best_model.set_weights(latest_model.get_weights())
+            best_infer = latest_infer
+            self_play_infer = self_play_inference(best_model, best_infer)
+            checkpointer.save(best_model, './model/best.h5')
+            generation += 1
+            print('Change BestPlayer')
+
+    # 남은 저장 완료 대기
+    checkpointer.close()
+
+
+# 동작 확인
+if __name__ == '__main__':
+    train_pipeline()
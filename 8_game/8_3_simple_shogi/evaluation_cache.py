@@ -0,0 +1,97 @@
+# ====================
+# 뉴럴 네트워크 평가 캐시
+# ====================
+
+# 패키지 임포트
+from collections import OrderedDict
+from threading import Lock
+import numpy as np
+import os
+
+# 파라미터 준비
+EC_CAPACITY = 200000  # 보관할 최대 국면 수
+
+
+# 국면별 정책과 가치를 보관하는 LRU 캐시
+class EvaluationCache:
+    # 초기화
+    def __init__(self, model_path='./model/best.h5', capacity=EC_CAPACITY):
+        self.model_path = model_path  # 캐시가 대응하는 모델 파일
+        self.capacity = capacity
+        self.entries = OrderedDict()  # 국면 키 → (정책, 가치)
+        self.lock = Lock()  # 여러 게임 스레드에서 공유
+        self.hits = 0  # 적중 수
+        self.misses = 0  # 실패 수
+        self.generation = self.model_generation()
+
+    # 모델 세대(모델 파일의 갱신 시각과 크기)
+    def model_generation(self):
+        if not os.path.exists(self.model_path):
+            return None
+        stat = os.stat(self.model_path)
+        return stat.st_mtime_ns, stat.st_size
+
+    # 모델 세대가 바뀐 경우 캐시 무효화(generation: 메모리의 모델 세대, None: 모델 파일로 판정)
+    def validate(self, generation=None):
+        if generation is None:
+            generation = self.model_generation()
+        if generation != self.generation:
+            self.clear()
+            self.generation = generation
+
+    # 캐시 비우기
+    def clear(self):
+        with self.lock:
+            self.entries.clear()
+            self.hits = 0
+            self.misses = 0
+
+    # 국면 키 얻기(0/1 입력 플레인을 비트로 압축)
+    def key(self, x):
+        return np.packbits(x > 0).tobytes()
+
+    # 추론 함수에 캐시 적용(모델 로드 직후 호출)
+    def wrap(self, infer, generation=None):
+        # 로드한 모델과 다른 세대의 항목은 버림
+        self.validate(generation)
+
+        def cached_infer(x):
+            keys = [self.key(row) for row in x]
+            results = [None] * len(x)
+
+            # 캐시에서 얻기
+            with self.lock:
+                for i, key in enumerate(keys):
+                    entry = self.entries.get(key)
+                    if entry is not None:
+                        self.entries.move_to_end(key)
+                        results[i] = entry
+                misses = [i for i, entry in enumerate(results) if entry is None]
+                self.hits += len(x) - len(misses)
+                self.misses += len(misses)
+
+            # 캐시에 없는 국면만 일괄 추론
+            if misses:
+                y = infer(x[misses])
+                with self.lock:
+                    for j, i in enumerate(misses):
+                        results[i] = (y[0][j], y[1][j])
+                        self.entries[keys[i]] = results[i]
+                        self.entries.move_to_end(keys[i])
+                    while len(self.entries) > self.capacity:
+                        self.entries.popitem(last=False)
+
+            # 추론 함수와 같은 형식으로 반환
+            return [np.array([p for p, _ in results]), np.array([v for _, v in results])]
+
+        return cached_infer
+
+    # 적중률
+    def hit_rate(self):
+        total = self.hits + self.misses
+        return self.hits / total if total else 0.0
+
+    # 문자열 표시
+    def __str__(self):
+        return 'hits {} misses {} rate {:.1%} size {}'.format(
+            self.hits, self.misses, self.hit_rate(), len(self.entries))
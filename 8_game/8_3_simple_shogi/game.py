@@ -6,11 +6,22 @@
 import random
 import math
 
+# 조브리스트 해시용 난수(고정 시드)
+zobrist_random = random.Random(0)
+ZOBRIST_BOARD = [[[zobrist_random.getrandbits(64) for _ in range(5)] for _ in range(12)]
+                 for _ in range(2)]  # [선 수/후 수][매스][말의 종류]
+ZOBRIST_HAND = [[[zobrist_random.getrandbits(64) for _ in range(3)] for _ in range(4)]
+                for _ in range(2)]  # [선 수/후 수][말의 종류][획득한 수]
+ZOBRIST_SIDE = zobrist_random.getrandbits(64)  # 후 수 차례
+
+# 학습 데이터 증강용 대칭 변환(행동이 말의 방향을 포함하므로 변환 없음)
+SYMMETRIES = [(list(range(12)), list(range(132)))]
+
 
 # 게임 상태
 class State:
     # 초기화
-    def __init__(self, pieces=None, enemy_pieces=None, depth=0):
+    def __init__(self, pieces=None, enemy_pieces=None, depth=0, zobrist=None):
         # 방향 정수
         self.dxy = ((0, -1), (1, -1), (1, 0), (1, 1), (0, 1), (-1, 1), (-1, 0), (-1, -1))
 
@@ -24,6 +35,21 @@ class State:
             self.pieces = [0, 0, 0, 0, 0, 0, 0, 1, 0, 2, 4, 3, 0, 0, 0]
             self.enemy_pieces = [0, 0, 0, 0, 0, 0, 0, 1, 0, 2, 4, 3, 0, 0, 0]
 
+        # 조브리스트 해시(다음 상태는 차분으로 갱신)
+        self.zobrist = zobrist if zobrist != None else self.compute_zobrist()
+
+    # 조브리스트 해시 계산(매스 번호는 각 플레이어 시점)
+    def compute_zobrist(self):
+        own = self.depth % 2
+        zobrist = 0 if own == 0 else ZOBRIST_SIDE
+        for color, pieces in ((own, self.pieces), (1 - own, self.enemy_pieces)):
+            for i in range(12):
+                if pieces[i] != 0:
+                    zobrist ^= ZOBRIST_BOARD[color][i][pieces[i]]
+            for capture in range(1, 4):
+                zobrist ^= ZOBRIST_HAND[color][capture][pieces[11 + capture]]
+        return zobrist
+
     # 패배 여부 판정
     def is_lose(self):
         for i in range(12):
@@ -117,7 +143,9 @@ class State:
     # 다음 상태 얻기
     def next(self, action):
         # 다음 상태 생성
-        state = State(self.pieces.copy(), self.enemy_pieces.copy(), self.depth + 1)
+        own = self.depth % 2
+        state = State(self.pieces.copy(), self.enemy_pieces.copy(), self.depth + 1,
+                      self.zobrist ^ ZOBRIST_SIDE)
 
         # 행동을 (이동 대상 위치, 이동 전 위치)로 변환
         position_dst, position_src = self.action_to_position(action)
@@ -132,19 +160,28 @@ class State:
             # 말 이동
             state.pieces[position_dst] = state.pieces[position_src]
             state.pieces[position_src] = 0
+            state.zobrist ^= ZOBRIST_BOARD[own][position_src][state.pieces[position_dst]] ^ \
+                ZOBRIST_BOARD[own][position_dst][state.pieces[position_dst]]
 
             # 상대의 말이 존재하는 경우에는 획득
             piece_type = state.enemy_pieces[11 - position_dst]
             if piece_type != 0:
                 if piece_type != 4:
+                    count = state.pieces[11 + piece_type]
                     state.pieces[11 + piece_type] += 1  # 획득한 말 +1
+                    state.zobrist ^= ZOBRIST_HAND[own][piece_type][count] ^ \
+                        ZOBRIST_HAND[own][piece_type][count + 1]
                 state.enemy_pieces[11 - position_dst] = 0
+                state.zobrist ^= ZOBRIST_BOARD[1 - own][11 - position_dst][piece_type]
 
         # 획득한 상대방의 말 배치
         else:
             capture = position_src - 7
             state.pieces[position_dst] = capture
             state.pieces[11 + capture] -= 1  # 획득한 말 -1
+            count = state.pieces[11 + capture]
+            state.zobrist ^= ZOBRIST_BOARD[own][position_dst][capture] ^ \
+                ZOBRIST_HAND[own][capture][count + 1] ^ ZOBRIST_HAND[own][capture][count]
 
         # 말 교대
         w = state.pieces
@@ -5,14 +5,14 @@
 # 패키지 임포트
 from game import State
 from pv_mcts import pv_mcts_action
-from tensorflow.keras.models import load_model
+from folded_network import load_inference_model
 from pathlib import Path
 from threading import Thread
 import tkinter as tk
 from PIL import Image, ImageTk
 
 # 베스트 플레이어 모델 로드
-model = load_model('./model/best.h5')
+model = load_inference_model('./model/best.h5')
 
 
 # 게임 UI 정의
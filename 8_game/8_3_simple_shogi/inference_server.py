@@ -0,0 +1,91 @@
+# ====================
+# 추론 서버
+# ====================
+
+# 패키지 임포트
+from pv_mcts import inference_function
+from queue import Queue, Empty
+from threading import Thread
+import numpy as np
+import time
+
+# 파라미터 준비
+IS_BATCH_SIZE = 64  # 한 번에 추론할 최대 국면 수
+IS_TIMEOUT = 0.002  # 배치를 채우기 위해 기다리는 최대 시간(초)
+
+
+# 여러 게임의 추론 요청을 모아 일괄 추론하는 서버
+class InferenceServer:
+    # 초기화
+    def __init__(self, model, batch_size=IS_BATCH_SIZE, timeout=IS_TIMEOUT):
+        self.infer = inference_function(model)  # 모델은 서버만 보유
+        self.batch_size = batch_size
+        self.timeout = timeout
+        self.requests = Queue()  # (입력 데이터, 응답 큐)
+
+        # 추론 스레드 시작
+        self.thread = Thread(target=self.run, daemon=True)
+        self.thread.start()
+
+    # 추론 요청(inference_function()으로 생성한 함수와 같은 형식)
+    def __call__(self, x):
+        reply = Queue(1)
+        self.requests.put((x, reply))
+        y = reply.get()
+        if isinstance(y, Exception):
+            raise y
+        return y
+
+    # 요청 모으기
+    def collect(self):
+        # 첫 번째 요청이 도착할 때까지 대기
+        request = self.requests.get()
+        if request is None:
+            return None
+        batch = [request]
+        count = len(request[0])
+
+        # 배치 크기 또는 대기 시간 제한까지 추가 요청 모으기
+        deadline = time.perf_counter() + self.timeout
+        while count < self.batch_size:
+            remaining = deadline - time.perf_counter()
+            if remaining <= 0:
+                break
+            try:
+                request = self.requests.get(timeout=remaining)
+            except Empty:
+                break
+            if request is None:
+                self.requests.put(None)  # 이번 배치 처리 후 종료
+                break
+            batch.append(request)
+            count += len(request[0])
+        return batch
+
+    # 추론 스레드
+    def run(self):
+        while True:
+            # 요청 모으기
+            batch = self.collect()
+            if batch is None:
+                break
+
+            # 일괄 추론
+            try:
+                y = self.infer(np.concatenate([x for x, _ in batch]))
+            except Exception as e:
+                # 요청한 게임 쪽에서 예외 발생
+                for _, reply in batch:
+                    reply.put(e)
+                continue
+
+            # 요청별로 결과 반환
+            i = 0
+            for x, reply in batch:
+                reply.put([y[0][i:i + len(x)], y[1][i:i + len(x)]])
+                i += len(x)
+
+    # 서버 종료
+    def close(self):
+        self.requests.put(None)
+        self.thread.join()
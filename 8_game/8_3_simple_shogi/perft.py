@@ -0,0 +1,61 @@
+# ====================
+# 수 생성 검증과 속도 측정(perft)
+# ====================
+
+# 패키지 임포트
+from game import State
+import sys
+import time
+
+# 파라미터 준비
+PF_DEPTH = 5  # 기본 탐색 깊이
+
+# 초기 국면에서 깊이별 리프 노드 수(참조값)
+PF_COUNTS = {1: 4, 2: 17, 3: 123, 4: 980, 5: 8147, 6: 72160}
+
+
+# 깊이 제한 게임 트리의 리프 노드 수와 전체 노드 수 얻기
+def perft(state, depth):
+    # 깊이에 도달하거나 게임 종료 시 리프 노드
+    if depth == 0 or state.is_done():
+        return 1, 1
+
+    # 합법적인 수마다 다음 상태를 탐색
+    leaves, nodes = 0, 1
+    for action in state.legal_actions():
+        l, n = perft(state.next(action), depth - 1)
+        leaves += l
+        nodes += n
+    return leaves, nodes
+
+
+# 깊이별로 리프 노드 수를 참조값과 비교하고 속도 출력
+def run_perft(max_depth):
+    ok = True
+    for depth in range(1, max_depth + 1):
+        # 측정
+        start = time.perf_counter()
+        leaves, nodes = perft(State(), depth)
+        elapsed = time.perf_counter() - start
+
+        # 참조값과 비교
+        expected = PF_COUNTS.get(depth)
+        if expected is None:
+            result = '-'
+        elif leaves == expected:
+            result = 'OK'
+        else:
+            result = 'NG(expected {})'.format(expected)
+            ok = False
+
+        # 출력
+        print('depth {:2} leaves {:10} nodes {:10} {:8.2f}s {:12.0f} nodes/s {}'.format(
+            depth, leaves, nodes, elapsed, nodes / elapsed if elapsed else 0, result))
+    return ok
+
+
+# 동작 확인
+if __name__ == '__main__':
+    depth = int(sys.argv[1]) if len(sys.argv) > 1 else PF_DEPTH
+    if not run_perft(depth):
+        sys.exit(1)
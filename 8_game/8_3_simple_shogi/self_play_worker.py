@@ -0,0 +1,29 @@
+# ====================
+# 넘파이 추론 셀프 플레이 워커
+# ====================
+
+# 패키지 임포트(TensorFlow를 임포트하지 않으므로 워커 프로세스의 메모리 사용량이 작음)
+from self_play import play, evaluation_cache
+from training_data import history_to_arrays, write_arrays
+from numpy_network import load_numpy_network
+import sys
+
+
+# 워커 실행(python self_play_worker.py 워커 번호 게임 수 저장 경로, self_play.py에서 실행)
+if __name__ == '__main__':
+    worker, game_count, path = int(sys.argv[1]), int(sys.argv[2]), sys.argv[3]
+
+    # 베스트 플레이어의 넘파이 가중치 파일 로드(self_play.py에서 미리 변환)
+    infer = evaluation_cache.wrap(load_numpy_network())
+
+    # 게임 실행(진행 상황은 표준 에러 출력)
+    history = []
+    for i in range(game_count):
+        history.extend(play(infer))
+        print('\rSelfPlay worker {} {}/{}'.format(worker, i + 1, game_count), end='', file=sys.stderr)
+
+    # 학습 데이터 저장
+    write_arrays(path, history_to_arrays(history))
+
+    # 캐시 적중 수를 표준 출력으로 전달
+    print(evaluation_cache.hits, evaluation_cache.misses)
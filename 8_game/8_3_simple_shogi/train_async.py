@@ -0,0 +1,134 @@
+# ====================
+# 셀프 플레이, 학습, 평가를 동시에 실행하는 학습 사이클
+# ====================
+
+# 패키지 임포트
+from dual_network import dual_network
+from self_play import play, write_data, evaluation_cache
+from pv_mcts import inference_function
+from folded_network import load_inference_model
+from train_network import train_network
+from evaluate_network import evaluate_network
+from training_data import TD_SUFFIX
+from tensorflow.keras import backend as K
+from multiprocessing import get_context
+from pathlib import Path
+import tensorflow as tf
+import time
+import os
+
+# 파라미터 준비
+TA_SELF_PLAY_PROCESS_COUNT = 2  # 셀프 플레이 워커 프로세스 수
+TA_GAMES_PER_FILE = 100  # 셀프 플레이 워커가 파일 1개에 모을 게임 수
+TA_TRAIN_FILES = 5  # 학습 1회를 시작하는 데 필요한 새 학습 데이터 파일 수
+TA_TRAIN_COUNT = 10  # 학습 횟수(train_cycle.py의 사이클 수에 해당)
+TA_POLL_INTERVAL = 1.0  # 파일 갱신 확인 간격(초)
+
+
+# 모델 파일의 갱신 시각(파일이 없는 경우 None)
+def model_stamp(path):
+    return os.stat(path).st_mtime_ns if os.path.exists(path) else None
+
+
+# 셀프 플레이 프로세스(베스트 플레이어로 게임을 계속 생성)
+def self_play_process(worker, stop):
+    # 코어를 프로세스끼리 나눠 쓰도록 프로세스당 스레드 1개로 제한
+    tf.config.threading.set_intra_op_parallelism_threads(1)
+    tf.config.threading.set_inter_op_parallelism_threads(1)
+
+    stamp = None
+    while not stop.is_set():
+        # 베스트 플레이어가 교대된 경우 다시 로드
+        if model_stamp('./model/best.h5') != stamp:
+            stamp = model_stamp('./model/best.h5')
+            K.clear_session()
+            infer = evaluation_cache.wrap(inference_function(load_inference_model('./model/best.h5')))
+
+        # TA_GAMES_PER_FILE 게임마다 학습 데이터 저장
+        history = []
+        for _ in range(TA_GAMES_PER_FILE):
+            if stop.is_set():
+                break
+            history.extend(play(infer))
+        if history:
+            write_data(history, '_{}'.format(worker))
+            print('SelfPlay worker {} {}'.format(worker, evaluation_cache))
+
+
+# 학습 프로세스(새 학습 데이터가 모일 때마다 최신 플레이어 갱신)
+def train_process(stop):
+    used = set()  # 학습에 사용한 학습 데이터 파일
+    count = 0
+    while count < TA_TRAIN_COUNT and not stop.is_set():
+        # 새 학습 데이터 파일이 TA_TRAIN_FILES개 모일 때까지 대기
+        paths = set(Path('./data').glob('*' + TD_SUFFIX))
+        if len(paths - used) < TA_TRAIN_FILES:
+            time.sleep(TA_POLL_INTERVAL)
+            continue
+        used |= paths
+
+        # 리플레이 버퍼로 학습해 latest.h5 저장
+        count += 1
+        print('Train', count, '====================')
+        train_network()
+
+
+# 평가 프로세스(latest.h5가 갱신될 때마다 베스트 플레이어와 대전)
+def evaluate_process(stop):
+    stamp = model_stamp('./model/latest.h5')
+    while True:
+        # 최신 플레이어 갱신 대기(종료 요청 후에도 마지막 최신 플레이어는 평가)
+        if model_stamp('./model/latest.h5') == stamp:
+            if stop.is_set():
+                break
+            time.sleep(TA_POLL_INTERVAL)
+            continue
+        stamp = model_stamp('./model/latest.h5')
+
+        # 신규 파라미터 평가 파트(승격 시 best.h5 교체)
+        evaluate_network()
+
+
+# 도중에 종료된 단계의 프로세스(학습 프로세스 외에는 종료 요청 전에 끝나면 실패)
+def dead_stage(processes, trainer):
+    if trainer.exitcode not in (None, 0):
+        return trainer
+    for process in processes:
+        if process.exitcode is not None:
+            return process
+    return None
+
+
+# 학습 사이클 실행
+def train_async():
+    # 듀얼 네트워크 생성
+    dual_network()
+
+    # TensorFlow를 로드한 프로세스는 fork할 수 없으므로 spawn으로 생성
+    context = get_context('spawn')
+    stop = context.Event()  # 종료 요청
+    processes = [context.Process(target=self_play_process, args=(i, stop), name='SelfPlay{}'.format(i))
+                 for i in range(TA_SELF_PLAY_PROCESS_COUNT)]
+    processes.append(context.Process(target=evaluate_process, args=(stop,), name='Evaluate'))
+    trainer = context.Process(target=train_process, args=(stop,), name='Train')
+    for process in processes + [trainer]:
+        process.start()
+
+    # TA_TRAIN_COUNT회 학습하면 종료(어느 단계든 도중에 종료되면 나머지 단계도 종료)
+    failed = None
+    while failed is None and trainer.exitcode is None:
+        trainer.join(TA_POLL_INTERVAL)
+        failed = dead_stage(processes, trainer)
+    stop.set()
+    for process in processes + [trainer]:
+        process.join()
+
+    # 종료 요청 후 마지막 평가에서 실패한 경우도 포함해 오류 보고
+    failed = failed or next((p for p in processes if p.exitcode != 0), None)
+    if failed is not None:
+        raise RuntimeError('{} process exited with {}'.format(failed.name, failed.exitcode))
+
+
+# 동작 확인
+if __name__ == '__main__':
+    train_async()
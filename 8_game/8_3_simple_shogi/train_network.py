@@ -3,40 +3,118 @@
 # ====================
 
 # 패키지 임포트
-from dual_network import DN_INPUT_SHAPE
+from dual_network import DN_INPUT_SHAPE, DN_OUTPUT_SIZE
+from game import SYMMETRIES
+from training_data import read_arrays, TD_SUFFIX
 from tensorflow.keras.callbacks import LearningRateScheduler, LambdaCallback
 from tensorflow.keras.models import load_model
 from tensorflow.keras import backend as K
 from pathlib import Path
+from math import ceil
+import tensorflow as tf
 import numpy as np
-import pickle
+import os
 
 # 파라미터 준비
 RN_EPOCHS = 100  # 학습 횟수
+RN_BUFFER_FILES = 10  # 리플레이 버퍼에 넣을 최근 셀프 플레이 파일 수(오리지널: 1)
+RN_BUFFER_POSITIONS = 100000  # 리플레이 버퍼에 넣을 최대 국면 수(최근 국면 우선)
+RN_BATCH_SIZE = 128  # 배치 크기
+RN_AUGMENT = True  # 보드의 대칭 변환으로 학습 데이터 증강
 
+# 리플레이 버퍼(학습 데이터 파일 경로 → 메모리 맵 배열, 사이클 간 유지)
+replay_buffer = {}
 
-# 학습 데이터 로드
+
+# 학습 데이터 로드(리플레이 버퍼에 넣을 세대별 메모리 맵 배열의 리스트)
 def load_data():
-    history_path = sorted(Path('./data').glob('*.history'))[-1]
-    with history_path.open(mode='rb') as f:
-        return pickle.load(f)
+    # 최근 RN_BUFFER_FILES개의 학습 데이터 파일
+    history_paths = sorted(Path('./data').glob('*' + TD_SUFFIX))[-RN_BUFFER_FILES:]
+
+    # 윈도우에서 벗어난 세대는 메모리에서 해제
+    for path in list(replay_buffer):
+        if path not in history_paths:
+            del replay_buffer[path]
+
+    # 아직 로드하지 않은 세대만 파일에서 읽기
+    for path in history_paths:
+        if path not in replay_buffer:
+            replay_buffer[path] = read_arrays(path)
+
+    # 최근 RN_BUFFER_POSITIONS개의 국면이 남도록 오래된 세대부터 잘라내기(복사 없음)
+    sources = []
+    remaining = RN_BUFFER_POSITIONS
+    for path in reversed(history_paths):
+        count = min(len(replay_buffer[path][2]), remaining)
+        if count > 0:
+            sources.insert(0, [a[-count:] for a in replay_buffer[path]])
+        remaining -= count
+    return sources
+
+
+# 국면마다 무작위로 고른 대칭 변환을 입력 데이터와 정책에 적용
+def augment(xs, y_policies):
+    # 대칭 변환별 인덱스 배열
+    board_perms = np.array([board_perm for board_perm, _ in SYMMETRIES])
+    action_perms = np.array([action_perm for _, action_perm in SYMMETRIES])
+
+    # 매스 축을 1차원으로 펼쳐 한 번에 재배열
+    n, a, b, c = xs.shape
+    k = np.random.randint(len(SYMMETRIES), size=n)
+    rows = np.arange(n)[:, None]
+    xs = xs.reshape(n, a * b, c)[rows, board_perms[k]].reshape(n, a, b, c)
+    y_policies = y_policies[rows, action_perms[k]]
+    return xs, y_policies
+
+
+# 디스크에서 배치 단위로 학습 데이터를 읽는 데이터셋 생성
+def make_dataset(sources):
+    # 세대별 국면 번호의 시작 위치
+    offsets = np.cumsum([0] + [len(values) for _, _, values in sources])
+
+    # 에포크마다 전체 국면을 섞어 배치 단위로 읽기
+    def generate():
+        order = np.random.permutation(offsets[-1])
+        for start in range(0, len(order), RN_BATCH_SIZE):
+            # 같은 세대의 국면끼리 모아 파일 순서대로 읽기
+            batch = np.sort(order[start:start + RN_BATCH_SIZE])
+            files = np.searchsorted(offsets, batch, side='right') - 1
+            arrays = [[], [], []]
+            for i in np.unique(files):
+                rows = batch[files == i] - offsets[i]
+                for array, source in zip(arrays, sources[i]):
+                    array.append(source[rows])
+
+            # 학습을 위한 자료형으로 변환(입력 데이터는 저장 시 셰이프 변환 완료)
+            xs, y_policies, y_values = [np.concatenate(a).astype(np.float32) for a in arrays]
+
+            # 대칭 변환으로 학습 데이터 증강
+            if RN_AUGMENT:
+                xs, y_policies = augment(xs, y_policies)
+            yield xs, (y_policies, y_values)
+
+    # 에포크마다 제너레이터를 다시 실행하고, 학습과 겹쳐서 다음 배치를 미리 읽기
+    a, b, c = DN_INPUT_SHAPE
+    dataset = tf.data.Dataset.from_generator(generate, output_signature=(
+        tf.TensorSpec((None, a, b, c), tf.float32),
+        (tf.TensorSpec((None, DN_OUTPUT_SIZE), tf.float32), tf.TensorSpec((None,), tf.float32))))
+    return dataset.repeat().prefetch(tf.data.AUTOTUNE)
 
 
-# 듀얼 네트워크 학습
-def train_network():
+# 듀얼 네트워크 학습(model: 베스트 플레이어의 가중치를 넣은 상주 모델)
+def train_network(model=None):
     # 학습 데이터 로드
-    history = load_data()
-    xs, y_policies, y_values = zip(*history)
+    sources = load_data()
+    positions = sum(len(values) for _, _, values in sources)
+    print('ReplayBuffer {} positions from {} files'.format(positions, len(sources)))
 
-    # 학습을 위한 입력 데이터 셰이프로 변환
-    a, b, c = DN_INPUT_SHAPE
-    xs = np.array(xs)
-    xs = xs.reshape(len(xs), c, a, b).transpose(0, 2, 3, 1)
-    y_policies = np.array(y_policies)
-    y_values = np.array(y_values)
+    # 학습 데이터를 메모리에 모두 올리지 않고 읽는 데이터셋
+    dataset = make_dataset(sources)
 
-    # 베스트 플레이어 모델 로드
-    model = load_model('./model/best.h5')
+    # 베스트 플레이어 모델 로드(상주 모델이 주어진 경우 그대로 학습)
+    resident = model is not None
+    if not resident:
+        model = load_model('./model/best.h5')
 
     # 모델 컴파일
     model.compile(loss=['categorical_crossentropy', 'mse'], optimizer='adam')
@@ -55,13 +133,18 @@ def train_network():
         on_epoch_begin=lambda epoch, logs:
         print('\rTrain {}/{}'.format(epoch + 1, RN_EPOCHS), end=''))
 
-    # 학습 실행
-    model.fit(xs, [y_policies, y_values], batch_size=128, epochs=RN_EPOCHS,
+    # 학습 실행(반복하는 데이터셋이므로 1에포크의 배치 수를 지정, 섞기는 데이터셋에서 수행)
+    model.fit(dataset, epochs=RN_EPOCHS, steps_per_epoch=ceil(positions / RN_BATCH_SIZE), shuffle=False,
               verbose=0, callbacks=[lr_decay, print_callback])
     print('')
 
-    # 최신 플레이어 모델 저장
-    model.save('./model/latest.h5')
+    # 상주 모델의 저장은 호출한 쪽에서 수행
+    if resident:
+        return
+
+    # 최신 플레이어 모델 저장(임시 파일에 저장한 후 교체)
+    model.save('./model/latest.tmp.h5')
+    os.replace('./model/latest.tmp.h5', './model/latest.h5')
 
     # 모델 파기
     K.clear_session()